@@ -1,9 +1,29 @@
 import os
+import sys
+import hashlib
 import logging
 from configparser import ConfigParser
 from playwright.sync_api import sync_playwright
 import allure
 
+from pages.login_page import Login_Page
+
+# The utils modules import each other by module name (import queue_logging);
+# import them the same way here so every module is loaded only once
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "utils"))
+
+import json_logging
+from artifact_writer import ArtifactWriter
+from auth_state_utils import StorageStateCache
+from context_pool import ContextPool
+from queue_logging import (
+    attach_queue,
+    buffered,
+    console_handler,
+    stop_queue_logging,
+)
+
+TRACING_MODES = ("off", "on", "retain-on-failure", "on-first-retry")
 
 def is_local():
     """Determine if the environment is local or CI."""
@@ -11,19 +31,18 @@ def is_local():
 
 def setup_directories(context):
     """Set up required directories based on flags."""
-    context.screenshot_dir = "screenshots"
+    context.screenshot_dir = os.path.join(context.artifacts_dir, "screenshots")
     os.makedirs(context.screenshot_dir, exist_ok=True)
 
     if context.config.userdata.get("record_video", "false").lower() == "true":
-        context.video_dir = "videos"
+        context.video_dir = os.path.join(context.artifacts_dir, "videos")
         os.makedirs(context.video_dir, exist_ok=True)
 
-    context.trace_dir = "traces"
+    context.trace_dir = os.path.join(context.artifacts_dir, "traces")
     os.makedirs(context.trace_dir, exist_ok=True)
 
-def get_screenshot_path(scenario_name, step_name=None):
+def get_screenshot_path(scenario_name, step_name=None, base_dir="screenshots"):
     """Generate a file path for storing screenshots."""
-    base_dir = "screenshots"
     os.makedirs(base_dir, exist_ok=True)
 
     name = scenario_name.replace(" ", "_").replace("/", "_")
@@ -47,12 +66,94 @@ def attach_screenshot_to_allure(path, name):
     except Exception as e:
         logging.error(f"Could not attach screenshot: {e}")
 
+def attach_screenshot_bytes_to_allure(data, name, image_format):
+    """Attach in-memory screenshot bytes to the Allure report."""
+    attachment_type = allure.attachment_type.JPG if image_format == "jpeg" else allure.attachment_type.PNG
+    try:
+        allure.attach(data, name=name, attachment_type=attachment_type)
+        logging.info(f"Screenshot attached: {name}")
+    except Exception as e:
+        logging.error(f"Could not attach screenshot: {e}")
+
+def capture_screenshot_in_memory(context, name):
+    """
+    Take a screenshot as bytes and attach it without writing it to disk.
+    A frame identical to the previous one of the scenario is not attached again.
+    """
+    options = {"type": context.screenshot_format, "scale": context.screenshot_scale}
+    if context.screenshot_format == "jpeg":
+        options["quality"] = context.screenshot_quality
+    data = context.page.screenshot(**options)
+
+    digest = hashlib.sha1(data).hexdigest()
+    if context.screenshot_dedup and digest == context.last_screenshot_digest:
+        logging.info(f"Screenshot identical to '{context.last_screenshot_name}', not attached: {name}")
+        note = f"Identical to previous screenshot: {context.last_screenshot_name}"
+        allure.attach(note, name=name, attachment_type=allure.attachment_type.TEXT)
+        return
+
+    context.last_screenshot_digest = digest
+    context.last_screenshot_name = name
+    attach_screenshot_bytes_to_allure(data, name, context.screenshot_format)
+
+def save_screenshot(context, path, name):
+    """
+    Take a screenshot of the current page, save it to path and attach it to Allure.
+    With async_artifacts the file is written on the artifact writer thread; the
+    Allure attachment is always made here, while the step it belongs to is open.
+    With screenshot_mode=memory nothing is written to disk.
+    """
+    if context.screenshot_mode == "memory":
+        capture_screenshot_in_memory(context, name)
+    elif context.artifact_writer:
+        data = context.page.screenshot()
+        context.artifact_writer.write_bytes(path, data)
+        attach_screenshot_bytes_to_allure(data, name, "png")
+    else:
+        context.page.screenshot(path=path)
+        attach_screenshot_to_allure(path, name)
+
+def flush_runtime_data():
+    """Write pending runtime data changes, if runtime_data_utils is in use."""
+    for module_name in ("runtime_data_utils", "utils.runtime_data_utils"):
+        module = sys.modules.get(module_name)
+        if module is not None:
+            module.flush_run_time_data()
+
+def log_assert_pass_counts():
+    """Log and reset the passed assertions counted by custom_assert (pass_mode="count"), if it is in use."""
+    for module_name in ("custom_assert", "utils.custom_assert"):
+        module = sys.modules.get(module_name)
+        if module is not None:
+            module.log_pass_counts()
+
+def close_db_pools():
+    """Close pooled database connections, if db_pool is in use, and log pool and query cache stats."""
+    for module_name in ("db_pool", "utils.db_pool"):
+        module = sys.modules.get(module_name)
+        if module is not None:
+            for name, stats in module.close_all_pools().items():
+                logging.info(
+                    f"DB pool {name}: {stats['checkouts']} checkout(s), "
+                    f"wait avg {stats['avg_wait_seconds'] * 1000:.1f} ms / max {stats['max_wait_seconds'] * 1000:.1f} ms, "
+                    f"{stats['failed_health_checks']} failed health check(s)"
+                )
+    for module_name in ("db_cache", "utils.db_cache"):
+        module = sys.modules.get(module_name)
+        if module is not None and module.query_cache.hits + module.query_cache.misses:
+            stats = module.query_cache.stats()
+            logging.info(
+                f"DB query cache: {stats['hits']} hit(s), {stats['misses']} miss(es), "
+                f"{stats['evictions']} evicted, {stats['expirations']} expired"
+            )
+
 def load_config(context):
     """Load settings from behave.ini."""
     config = ConfigParser()
     config.read("behave.ini")
 
-    profile = f"behave:{context.config.userdata.get('profile', 'sit')}"
+    context.profile = context.config.userdata.get("profile", "sit")
+    profile = f"behave:{context.profile}"
     if profile not in config:
         raise ValueError(f"Profile '{profile}' not found in behave.ini")
 
@@ -60,25 +161,151 @@ def load_config(context):
     context.base_url = section.get("baseUrl")
     context.api_url = section.get("apiUrl")
     context.browser_type = section.get("browserType", "chrome").lower()
+    context.login_url = section.get("loginUrl")
 
     context.headless = not is_local()
     context.screenshot_on_step = context.config.userdata.get("screenshot_on_step", "false").lower() == "true"
 
+    # screenshot_mode=memory attaches screenshot bytes directly (no files in screenshots/)
+    context.screenshot_mode = context.config.userdata.get("screenshot_mode", "file").lower()
+    context.screenshot_dedup = context.config.userdata.get("screenshot_dedup", "true").lower() == "true"
+    context.screenshot_format = context.config.userdata.get("screenshot_format", "png").lower()
+    context.screenshot_quality = int(context.config.userdata.get("screenshot_quality", "80"))
+    context.screenshot_scale = context.config.userdata.get("screenshot_scale", "device").lower()
+
+    # Set by parallel_runner.py so every worker keeps its artifacts apart
+    context.worker_id = context.config.userdata.get("worker_id")
+    context.artifacts_dir = context.config.userdata.get("artifacts_dir", "")
+
+    # Reuse browser contexts between scenarios (scenarios tagged @isolated always get a fresh one)
+    context.use_context_pool = context.config.userdata.get("context_pool", "false").lower() == "true"
+    context.context_pool_size = int(context.config.userdata.get("context_pool_size", "1"))
+
+    # Scenarios tagged @authenticated start logged in with a cached storage state
+    context.auth_user = context.config.userdata.get("auth_user", os.getenv("AUTH_USER", ""))
+    context.auth_password = context.config.userdata.get("auth_password", os.getenv("AUTH_PASSWORD", ""))
+    context.auth_state_ttl = int(context.config.userdata.get("auth_state_ttl", "1800"))
+    context.auth_state_verify = context.config.userdata.get("auth_state_verify", "false").lower() == "true"
+
+    context.tracing_mode = context.config.userdata.get("tracing", "on").lower()
+    if context.tracing_mode not in TRACING_MODES:
+        raise ValueError(f"Invalid tracing mode '{context.tracing_mode}'. Use one of: {', '.join(TRACING_MODES)}")
+    context.trace_chunks = context.config.userdata.get("trace_chunks", "false").lower() == "true"
+
+    # log_mode=queue: hooks only enqueue log records, a listener thread writes them (buffered)
+    context.log_mode = context.config.userdata.get("log_mode", "sync").lower()
+    context.console_log_level = context.config.userdata.get("console_log_level", "INFO")
+    context.log_buffer_size = int(context.config.userdata.get("log_buffer_size", "1000"))
+    # log_format=json: test_log.jsonl with worker/scenario/step IDs instead of test_log.log
+    context.log_format = context.config.userdata.get("log_format", "text").lower()
+    # Write screenshot files and videos on a background thread
+    context.async_artifacts = context.config.userdata.get("async_artifacts", "false").lower() == "true"
+    context.artifact_queue_size = int(context.config.userdata.get("artifact_queue_size", "64"))
+
+def get_context_options(context):
+    """Options used for every new browser context."""
+    return {
+        "accept_downloads": True,
+        "viewport": {"width": 1280, "height": 800},
+        "ignore_https_errors": True,
+        "base_url": context.base_url,
+        "record_video_dir": context.video_dir if context.config.userdata.get("record_video", "false").lower() == "true" else None,
+    }
+
+
+def get_trace_path(context, scenario_name, step_name=None):
+    """Generate a file path for a scenario (or step chunk) trace."""
+    name = scenario_name.replace(" ", "_").replace("/", "_")
+    if step_name:
+        name = f"{name}__{step_name.replace(' ', '_').replace('/', '_')}"
+    return os.path.join(context.trace_dir, f"{name}.zip")
+
+def should_trace(tracing_mode, attempt):
+    """Whether a scenario run (1 = first attempt) is traced at all."""
+    if tracing_mode == "off":
+        return False
+    if tracing_mode == "on-first-retry":
+        return attempt == 2
+    return True
+
+def should_keep_trace(tracing_mode, failed):
+    """Whether a recorded trace (scenario or step chunk) is written to disk."""
+    return failed or tracing_mode != "retain-on-failure"
+
+def login_and_save_storage_state(context, path):
+    """Log in through the UI and save the storage state to path (raises if the login form is still shown)."""
+    browser_context = context.browser.new_context(base_url=context.base_url, ignore_https_errors=True)
+    try:
+        login_page = Login_Page(browser_context.new_page())
+        login_page.goto(context.login_url)
+        login_page.login(context.auth_user, context.auth_password)
+        login_page.page.wait_for_load_state("networkidle")
+        if login_page.is_login_form_visible():
+            # do not cache an unauthenticated state for auth_state_ttl
+            raise RuntimeError(f"Login failed for user: {context.auth_user}")
+        browser_context.storage_state(path=path)
+        logging.info(f"Storage state saved for user: {context.auth_user}")
+    finally:
+        browser_context.close()
+
+def get_auth_storage_state(context):
+    """Return the cached storage state file, logging in when it is missing or stale."""
+    return context.auth_cache.get(
+        context.profile,
+        context.auth_user,
+        lambda path: login_and_save_storage_state(context, path),
+    )
+
+def new_authenticated_context(context):
+    """Create a browser context that is already logged in."""
+    if not context.auth_user:
+        raise ValueError("@authenticated scenarios need a user: set -D auth_user=... (or AUTH_USER) and auth_password")
+    options = get_context_options(context)
+    browser_context = context.browser.new_context(storage_state=get_auth_storage_state(context), **options)
+
+    if context.auth_state_verify:
+        page = browser_context.new_page()
+        login_page = Login_Page(page)
+        login_page.goto(context.login_url)
+        session_expired = login_page.is_login_form_visible()
+        page.close()
+        if session_expired:
+            logging.info(f"Cached session expired for user: {context.auth_user}, logging in again")
+            browser_context.close()
+            context.auth_cache.invalidate(context.profile, context.auth_user)
+            browser_context = context.browser.new_context(storage_state=get_auth_storage_state(context), **options)
+
+    return browser_context
+
 
 def before_all(context):
     """Runs before all tests."""
+    load_config(context)
+
     # Configure logging
-    logging.basicConfig(
-        level=logging.INFO,
-        format="%(asctime)s - %(levelname)s - %(message)s",
-        handlers=[
-            logging.FileHandler("test_log.log"),
-            logging.StreamHandler()
-        ]
-    )
+    log_format = "%(asctime)s - %(levelname)s - %(message)s"
+    if context.worker_id is not None:
+        log_format = f"%(asctime)s - worker {context.worker_id} - %(levelname)s - %(message)s"
+    if context.artifacts_dir:
+        os.makedirs(context.artifacts_dir, exist_ok=True)
+    formatter = logging.Formatter(log_format)
+    json_logging.set_worker(context.worker_id)
+    if context.log_format == "json":
+        file_handler = json_logging.json_file_handler(os.path.join(context.artifacts_dir, "test_log.jsonl"))
+    else:
+        file_handler = logging.FileHandler(os.path.join(context.artifacts_dir, "test_log.log"))
+        file_handler.setFormatter(formatter)
+    console = console_handler(context.console_log_level, formatter)
+    if context.log_mode == "queue":
+        handlers = [buffered(file_handler, context.log_buffer_size)]
+        if console is not None:
+            handlers.append(console)
+        logging.getLogger().setLevel(logging.INFO)
+        attach_queue(logging.getLogger(), handlers)
+    else:
+        logging.basicConfig(level=logging.INFO, handlers=[file_handler] + ([console] if console else []))
     logging.info("Starting test suite")
 
-    load_config(context)
     setup_directories(context)
 
     context.playwright = sync_playwright().start()
@@ -94,70 +321,141 @@ def before_all(context):
     else:
         context.browser = context.playwright.chromium.launch(**launch_args)
 
+    context.artifact_writer = ArtifactWriter(context.artifact_queue_size) if context.async_artifacts else None
+    context.auth_cache = StorageStateCache(".auth", context.auth_state_ttl)
+    context.scenario_attempts = {}
+
+    context.context_pool = None
+    if context.use_context_pool:
+        context.context_pool = ContextPool(context.browser, get_context_options(context), context.context_pool_size)
+
 
 def before_scenario(context, scenario):
     """Runs before each scenario."""
+    # Retried scenarios (behave.contrib.scenario_autoretry) run these hooks again
+    attempt = context.scenario_attempts.get(str(scenario.location), 0) + 1
+    context.scenario_attempts[str(scenario.location)] = attempt
+    context.scenario_id = f"{scenario.location}#{attempt}"
+    context.step_index = 0
+    json_logging.set_scenario(context.scenario_id, scenario.name)
+
     context.scenario = scenario
+    context.last_screenshot_digest = None
+    context.last_screenshot_name = None
     logging.info(f"Starting scenario: {scenario.name}")
 
-    context.context = context.browser.new_context(
-        accept_downloads=True,
-        viewport={"width": 1280, "height": 800},
-        ignore_https_errors=True,
-        base_url=context.base_url,
-        record_video_dir="videos" if context.config.userdata.get("record_video", "false").lower() == "true" else None
+    authenticated = "authenticated" in scenario.effective_tags
+    context.pooled_context = (
+        context.context_pool is not None
+        and not authenticated
+        and "isolated" not in scenario.effective_tags
     )
+    if context.pooled_context:
+        context.context = context.context_pool.acquire()
+    elif authenticated:
+        context.context = new_authenticated_context(context)
+    else:
+        context.context = context.browser.new_context(**get_context_options(context))
     context.page = context.context.new_page()
-    context.context.tracing.start(screenshots=True, snapshots=True)
+
+    context.tracing_active = should_trace(context.tracing_mode, attempt)
+    if context.tracing_active:
+        context.context.tracing.start(screenshots=True, snapshots=True)
+
+
+def before_step(context, step):
+    """Runs before each step."""
+    context.step_index += 1
+    json_logging.set_step(f"{context.scenario_id}/{context.step_index}", step.name)
+    if context.tracing_active and context.trace_chunks:
+        context.context.tracing.start_chunk(title=step.name)
 
 
 def after_step(context, step):
     """Runs after each step."""
+    flush_runtime_data()
+    if context.tracing_active and context.trace_chunks:
+        if should_keep_trace(context.tracing_mode, step.status == "failed"):
+            trace_path = get_trace_path(context, context.scenario.name, step.name)
+            context.context.tracing.stop_chunk(path=trace_path)
+            logging.info(f"Trace chunk saved at: {trace_path}")
+        else:
+            context.context.tracing.stop_chunk()
+
     if context.screenshot_on_step:
-        path = get_screenshot_path(context.scenario.name, step.name)
-        context.page.screenshot(path=path)
+        path = get_screenshot_path(context.scenario.name, step.name, context.screenshot_dir)
+        save_screenshot(context, path, f"Screenshot for step: {step.name}")
         logging.info(f"Screenshot saved for step: {step.name}")
 
-        # Attach screenshot to Allure report
-        attach_screenshot_to_allure(path, f"Screenshot for step: {step.name}")
-
 
 def after_scenario(context, scenario):
     """Runs after each scenario."""
+    json_logging.set_step(None)
+    flush_runtime_data()
     try:
+        log_assert_pass_counts()
+
         # Final screenshot
-        path = get_screenshot_path(scenario.name)
-        context.page.screenshot(path=path)
+        path = get_screenshot_path(scenario.name, base_dir=context.screenshot_dir)
+        save_screenshot(context, path, f"Final screenshot for scenario: {scenario.name}")
         logging.info(f"Final screenshot saved for scenario: {scenario.name}")
 
-        # Attach final screenshot to Allure report
-        attach_screenshot_to_allure(path, f"Final screenshot for scenario: {scenario.name}")
-
         # Trace
         if context.config.userdata.get("record_video", "false").lower() == "true":
             video_path = context.page.video.path()
             final_video_path = os.path.join(context.video_dir, f"{scenario.name.replace(' ', '_')}.mp4")
-            os.rename(video_path, final_video_path)
+            if context.artifact_writer:
+                context.artifact_writer.rename(video_path, final_video_path)
+            else:
+                os.rename(video_path, final_video_path)
             logging.info(f"Video saved at: {final_video_path}")
        
-        trace_path = f"traces/{scenario.name.replace(' ', '_')}.zip"
-        context.context.tracing.stop(path=trace_path)
-        logging.info(f"Trace saved at: {trace_path}")
+        if context.tracing_active:
+            if context.trace_chunks or not should_keep_trace(context.tracing_mode, scenario.status == "failed"):
+                # Step chunks are already written; discard the rest without serializing it
+                context.context.tracing.stop()
+            else:
+                trace_path = get_trace_path(context, scenario.name)
+                context.context.tracing.stop(path=trace_path)
+                logging.info(f"Trace saved at: {trace_path}")
+            context.tracing_active = False
 
     except Exception as e:
         logging.error(f"Error during after_scenario: {e}")
 
     finally:
-        if context.page:
-            context.page.close()
-        if context.context:
-            context.context.close()
+        if context.pooled_context:
+            # Closes the pages and clears storage; stops tracing left running by an error above
+            context.context_pool.release(context.context, tracing=context.tracing_active)
+        else:
+            if context.page:
+                context.page.close()
+            if context.context:
+                context.context.close()
+
+        # The scenario's files are complete on disk before the next scenario starts
+        if context.artifact_writer:
+            context.artifact_writer.flush()
+        json_logging.set_scenario(None)
 
 
 def after_all(context):
     """Runs after all tests."""
+    if context.artifact_writer:
+        context.artifact_writer.close()
+        logging.info(
+            f"Artifact writer: {context.artifact_writer.completed} task(s) done, "
+            f"{context.artifact_writer.failed} failed, "
+            f"{context.artifact_writer.blocked_seconds:.2f}s blocked on a full queue"
+        )
+    if context.context_pool:
+        stats = context.context_pool.stats()
+        logging.info(f"Context pool: {stats['hits']} hit(s), {stats['misses']} miss(es), {stats['discarded']} discarded")
+        context.context_pool.close()
+    close_db_pools()
     if context.browser:
         context.browser.close()
     if context.playwright:
         context.playwright.stop()
-    logging.info("Test suite completed. Playwright shutdown completed.")
\ No newline at end of file
+    logging.info("Test suite completed. Playwright shutdown completed.")
+    stop_queue_logging()
\ No newline at end of file
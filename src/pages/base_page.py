@@ -1,13 +1,154 @@
 from playwright.sync_api import Page, Locator
-from typing import List, Optional, Any
+from typing import Dict, Iterator, List, Optional, Any, Set, Tuple
+
+# Reads header texts and td texts of the matched rows in one browser round trip.
+_TABLE_SNAPSHOT_JS = """
+(rows, [start, end, columns, headerSelector]) => {
+    const picked = rows.slice(start, end === null ? undefined : end);
+    const pick = cells => columns === null ? cells : columns.filter(c => c < cells.length).map(c => cells[c]);
+    return {
+        headers: pick(Array.from(document.querySelectorAll(headerSelector)).map(th => th.innerText)),
+        rows: picked.map(row => pick(Array.from(row.querySelectorAll("td")).map(td => td.innerText))),
+    };
+}
+"""
+
+# Reads the rows currently in the DOM with an optional row key attribute.
+_VISIBLE_ROWS_JS = """
+(rows, keyAttribute) => rows.map(row => ({
+    key: row.getAttribute(keyAttribute),
+    cells: Array.from(row.querySelectorAll("td")).map(td => td.innerText),
+}))
+"""
+
+# Scrolls a container by one viewport; returns false when it cannot scroll further.
+_SCROLL_ONE_PAGE_JS = """
+el => {
+    const before = el.scrollTop;
+    el.scrollTop = before + el.clientHeight;
+    return el.scrollTop !== before;
+}
+"""
+
+
+class Table_Snapshot:
+    """
+    In-memory copy of a table: header texts plus the td texts of every row.
+
+    A snapshot taken with a row/column slice behaves like a table that only
+    contains those rows/columns, i.e. row and column indices are relative to
+    the slice. A column slice applies to the headers as well.
+    """
+
+    def __init__(self, headers: List[str], rows: List[List[str]]):
+        self.headers = headers
+        self.rows = rows
+        self._index: Optional["Table_Index"] = None
+
+    def index(self) -> "Table_Index":
+        """Normalized lookup index of this snapshot (built on first use)."""
+        if self._index is None:
+            self._index = Table_Index(self.rows)
+        return self._index
+
+    def row_count(self) -> int:
+        return len(self.rows)
+
+    def column_count(self, row_index: int = 0) -> int:
+        return len(self.rows[row_index])
+
+    def cell(self, row: int, col: int) -> str:
+        return self.rows[row][col]
+
+    def row(self, row: int) -> List[str]:
+        return list(self.rows[row])
+
+    def column(self, col: int, number_of_rows: int = 0) -> List[str]:
+        rows = self.rows if number_of_rows == 0 else self.rows[:number_of_rows]
+        return [cells[col] for cells in rows]
+
+
+class Table_Index:
+    """
+    Trimmed + lowercased cell texts of a table with an inverted index
+    (cell text -> row numbers) for exact-match lookups.
+    """
+
+    def __init__(self, rows: List[List[str]]):
+        self.cells: List[List[str]] = [[c.strip().lower() for c in row if c is not None] for row in rows]
+        self._rows_by_cell: Dict[str, Set[int]] = {}
+        for i, row in enumerate(self.cells):
+            for cell in row:
+                self._rows_by_cell.setdefault(cell, set()).add(i)
+        self._positions: Dict[int, List[int]] = {}
+
+    def matching_rows(self, values: List[str], exact_match: bool = False, min_cells: int = -1) -> List[int]:
+        """
+        Return (ascending) numbers of the rows that have more than min_cells
+        cells and where every value equals (exact) or is contained in
+        (contains) one of the cells.
+        """
+        wanted = [v.strip().lower() for v in values]
+        if exact_match:
+            candidates: Optional[Set[int]] = None
+            # Intersect the smallest posting sets first
+            for value in sorted(set(wanted), key=lambda v: len(self._rows_by_cell.get(v, ()))):
+                rows = self._rows_by_cell.get(value)
+                if not rows:
+                    return []
+                candidates = set(rows) if candidates is None else candidates & rows
+                if not candidates:
+                    return []
+            rows_found = range(len(self.cells)) if candidates is None else sorted(candidates)
+            return [i for i in rows_found if len(self.cells[i]) > min_cells]
+
+        return [
+            i for i, row in enumerate(self.cells)
+            if len(row) > min_cells and all(any(value in cell for cell in row) for value in wanted)
+        ]
+
+    def position(self, row: int, min_cells: int) -> int:
+        """Position of row among the rows that have more than min_cells cells."""
+        if min_cells not in self._positions:
+            positions: List[int] = []
+            count = 0
+            for cells in self.cells:
+                positions.append(count)
+                if len(cells) > min_cells:
+                    count += 1
+            self._positions[min_cells] = positions
+        return self._positions[min_cells][row]
+
+    def count(self, min_cells: int) -> int:
+        """Number of rows that have more than min_cells cells."""
+        return sum(1 for cells in self.cells if len(cells) > min_cells)
+
 
 class Base_Page:
     def __init__(self, page: Page):
         self.page = page
+        self._table_snapshots: Dict[str, Table_Snapshot] = {}
 
     def goto(self, url: str):
+        self.invalidate_table_cache()
         self.page.goto(url, timeout=60000)
 
+    def get_cached_table_snapshot(self, locator: str = "tr") -> Table_Snapshot:
+        """
+        Return the cached snapshot of the table, taking it on first use.
+        Call invalidate_table_cache() after anything that changes the table.
+        """
+        if locator not in self._table_snapshots:
+            self._table_snapshots[locator] = self.get_table_snapshot(locator)
+        return self._table_snapshots[locator]
+
+    def invalidate_table_cache(self, locator: Optional[str] = None) -> None:
+        """Drop the cached snapshot of one table (or of all tables)."""
+        if locator is None:
+            self._table_snapshots.clear()
+        else:
+            self._table_snapshots.pop(locator, None)
+
     def drag_and_drop(self, source_selector, target_selector):
         try:
             self.page.drag_and_drop(source_selector, target_selector)
@@ -49,13 +190,34 @@ class Base_Page:
         value = (value or "").strip()
         return value if value != "" else "Invalid property" 
 
+    def get_table_snapshot(
+        self,
+        locator: str = "tr",
+        start_row: int = 0,
+        end_row: Optional[int] = None,
+        columns: Optional[List[int]] = None,
+        header_selector: str = "th",
+    ) -> Table_Snapshot:
+        """
+        Read the whole table (or a row/column slice) in a single evaluate_all call.
+        columns selects the same columns from the headers and from every row.
+        header_selector must be a CSS selector; it is evaluated in the page.
+        """
+        data = self.page.locator(locator).evaluate_all(
+            _TABLE_SNAPSHOT_JS, [start_row, end_row, columns, header_selector]
+        )
+        return Table_Snapshot(data["headers"], data["rows"])
+
     def get_cell_data(
         self, 
         row: int,
         col: int,
         locator: str = "tr",
+        snapshot: Optional[Table_Snapshot] = None,
     ) -> str:
         """Get cell text from row/col in a self.page-like locator."""
+        if snapshot is not None:
+            return str(snapshot.cell(row, col))
         val =  self.page.locator(locator).nth(row).locator("td").nth(col).inner_text()
         return str(val)
 
@@ -71,15 +233,15 @@ class Base_Page:
         self, 
         row: int,
         locator: str = "tr",
+        snapshot: Optional[Table_Snapshot] = None,
     ) :
         """Return each TD's inner_text in a row as a list."""
-        row_loc = self.page.locator(locator).nth(row)
-        count =  row_loc.locator("td").count()
-        arr: List[str] = []
-        for i in range(count):
-            txt =  row_loc.locator("td").nth(i).inner_text()
-            arr.append(str(txt))
-        return arr
+        if snapshot is None:
+            snapshot = self.get_table_snapshot(locator, start_row=row, end_row=row + 1)
+            if snapshot.row_count() == 0:
+                return []
+            row = 0
+        return [str(txt) for txt in snapshot.row(row)]
 
     def get_all_rows_column_data(
         self,
@@ -87,19 +249,20 @@ class Base_Page:
         column: int,
         locator: str = "tr",
         number_of_rows: int = 0,
+        snapshot: Optional[Table_Snapshot] = None,
     ) :
         """Return data for a single column from all (or first N) rows."""
-        arr: List[str] = []
-        actual_len = self.page.locator(locator).count()  # [1](https://playwright.dev/python/docs/api/class-locator)
-        length = actual_len if number_of_rows == 0 else min(actual_len, number_of_rows)
-
-        for i in range(length):
-            text = self.page.locator(locator).nth(i).locator("td").nth(column).inner_text()
-            arr.append(text)
-        return arr
-
-    def get_header_names(self) :
+        if snapshot is None:
+            snapshot = self.get_table_snapshot(
+                locator, end_row=None if number_of_rows == 0 else number_of_rows, columns=[column]
+            )
+            column = 0
+        return snapshot.column(column, number_of_rows)
+
+    def get_header_names(self, snapshot: Optional[Table_Snapshot] = None) :
         """Return all header names (<th>) as list."""
+        if snapshot is not None:
+            return list(snapshot.headers)
         return self.page.locator("th").all_inner_texts()  # [1](https://playwright.dev/python/docs/api/class-locator)
 
     def get_row(self,  index: int, locator: str = "tr") -> Locator:
@@ -110,24 +273,36 @@ class Base_Page:
         self,
         col_name: str,
         exact_match: bool = False,
+        snapshot: Optional[Table_Snapshot] = None,
     ) -> int:
         """Return index of header with matching name; -1 if not found."""
-        headers = self.page.locator("th").all_inner_texts()  # [1](https://playwright.dev/python/docs/api/class-locator)
+        headers = self.get_header_names(snapshot)
         target = col_name.strip()
         if exact_match:
             return next((i for i, h in enumerate(headers) if h.strip() == target), -1)
         return next((i for i, h in enumerate(headers) if h.strip().lower() == target.lower()), -1)
 
-    def get_header_name(self,  index: int) -> str:
+    def get_header_name(self,  index: int, snapshot: Optional[Table_Snapshot] = None) -> str:
         """Return text of header at index."""
+        if snapshot is not None:
+            return snapshot.headers[index]
         return self.page.locator("th").nth(index).inner_text()
 
-    def get_meta_rows_length(self,  locator: str = "tr"):
+    def get_meta_rows_length(self,  locator: str = "tr", snapshot: Optional[Table_Snapshot] = None):
         """Return number of rows. (TS had extra ' tr' - Python keeps it simple.)"""
+        if snapshot is not None:
+            return snapshot.row_count()
         return int(self.page.locator(locator).count())  # [1](https://playwright.dev/python/docs/api/class-locator)
 
-    def get_column_length(self,  row_index: int = 0, locator: str = "tr") :
+    def get_column_length(
+        self,
+        row_index: int = 0,
+        locator: str = "tr",
+        snapshot: Optional[Table_Snapshot] = None,
+    ) :
         """Return number of columns (td) in a given row."""
+        if snapshot is not None:
+            return snapshot.column_count(row_index)
         return int(self.page.locator(locator).nth(row_index).locator("td").count())
 
     def get_row_column(
@@ -155,45 +330,42 @@ class Base_Page:
             normalized.append(t)
         return normalized
 
+    def _resolve_snapshot(
+        self,
+        locator: str,
+        snapshot: Optional[Table_Snapshot],
+        cached: bool,
+        wait: bool = False,
+    ) -> Table_Snapshot:
+        if snapshot is not None:
+            return snapshot
+        if cached and locator in self._table_snapshots:
+            return self._table_snapshots[locator]
+        if wait:
+            self.page.locator(locator).nth(0).wait_for()  # ensure at least one row exists
+        if cached:
+            return self.get_cached_table_snapshot(locator)
+        return self.get_table_snapshot(locator)
+
     def get_matched_row_index(
         self,
         
         row_values: List[str],
         locator: str = "tr",
         exact_match: bool = False,
+        snapshot: Optional[Table_Snapshot] = None,
+        cached: bool = False,
     ) -> int:
         """
         Return index of first row that matches all row_values (exact or contains).
-        Returns -1 if none found.
+        Only rows with more than one cell are counted. Returns -1 if none found.
+        cached=True reuses the cached snapshot of the table (see invalidate_table_cache).
         """
         wanted = self._normalize_values(row_values)
+        index = self._resolve_snapshot(locator, snapshot, cached, wait=True).index()
 
-        rows = self.page.locator(locator)
-        rows.nth(0).wait_for()  # ensure at least one row exists
-        n_rows =  rows.count()  # [1](https://playwright.dev/python/docs/api/class-locator)
-
-        row_text_matrix: List[List[str]] = []
-        for i in range(n_rows):
-            # More reliable than parsing row.innerText: read per-cell
-            cells =  rows.nth(i).locator("td").all_inner_texts()
-            cells = [c.strip() for c in cells if c is not None]
-            if len(cells) > 1:
-                row_text_matrix.append(cells)
-
-        def matches(row_cells: List[str]) -> bool:
-            for col_data in wanted:
-                if exact_match:
-                    if not any(cell.strip().lower() == col_data.strip().lower() for cell in row_cells):
-                        return False
-                else:
-                    if not any(col_data.strip().lower() in cell.strip().lower() for cell in row_cells):
-                        return False
-            return True
-
-        for idx, row_cells in enumerate(row_text_matrix):
-            if matches(row_cells):
-                return idx
-        return -1
+        rows = index.matching_rows(wanted, exact_match, min_cells=1)
+        return index.position(rows[0], 1) if rows else -1
 
     def get_matched_row_indices(
         self,
@@ -201,33 +373,13 @@ class Base_Page:
         row_values: List[str],
         locator: str = "tr",
         exact_match: bool = False,
+        snapshot: Optional[Table_Snapshot] = None,
+        cached: bool = False,
     ) -> List[int]:
         """Return indices of all rows that match all row_values."""
         wanted = self._normalize_values(row_values)
-        found: List[int] = []
-
-        rows = self.page.locator(locator)
-        n_rows =  rows.count()  # [1](https://playwright.dev/python/docs/api/class-locator)
-
-        for i in range(n_rows):
-            cells =  rows.nth(i).locator("td").all_inner_texts()
-            row_cells = [c.strip() for c in cells if c is not None]
-
-            ok = True
-            for col_data in wanted:
-                if exact_match:
-                    if not any(cell.lower() == col_data.lower() for cell in row_cells):
-                        ok = False
-                        break
-                else:
-                    if not any(col_data.lower() in cell.lower() for cell in row_cells):
-                        ok = False
-                        break
-
-            if ok:
-                found.append(i)
-
-        return found
+        index = self._resolve_snapshot(locator, snapshot, cached).index()
+        return index.matching_rows(wanted, exact_match)
 
     def get_meta_page_matched_row_index(
         self,
@@ -235,9 +387,13 @@ class Base_Page:
         row_values: List[str],
         locator: str = "tr",
         exact_match: bool = False,
+        snapshot: Optional[Table_Snapshot] = None,
+        cached: bool = False,
     ) -> int:
         """Same as get_matched_row_index but keeps TS naming."""
-        return  self.get_matched_row_index(self.page, row_values, locator=locator, exact_match=exact_match)
+        return  self.get_matched_row_index(
+            row_values, locator=locator, exact_match=exact_match, snapshot=snapshot, cached=cached
+        )
 
     def get_meta_matched_row_indices(
         self,
@@ -246,48 +402,105 @@ class Base_Page:
         locator: str = "tr",
         exact_match: bool = False,
         min_column_size: int = 1,
+        snapshot: Optional[Table_Snapshot] = None,
+        cached: bool = False,
     ) -> List[int]:
         """
         Equivalent of TS getMetaself.pageMatchedRowIndices:
         - builds row arrays from td texts
         - filters rows by min_column_size
-        - returns all matched indices (prevent duplicates by clearing matched rows)
+        - returns all matched indices (positions among the filtered rows)
         """
         wanted = self._normalize_values(row_values)
-        found_indices: List[int] = []
+        index = self._resolve_snapshot(locator, snapshot, cached).index()
 
-        rows = self.page.locator(locator).all()  # locator.all() exists in Python [1](https://playwright.dev/python/docs/api/class-locator)
+        if not wanted:
+            # TS cleared each matched row and searched again; with nothing to
+            # match the cleared first row matches every time.
+            return [0] * index.count(min_column_size)
 
-        matrix: List[List[str]] = []
-        for row in rows:
-            cols =  row.locator("td").all()
-            row_cells: List[str] = []
-            for col in cols:
-                row_cells.append(( col.inner_text()).strip())
+        rows = index.matching_rows(wanted, exact_match, min_cells=min_column_size)
+        return [index.position(row, min_column_size) for row in rows]
 
-            if len(row_cells) > min_column_size:
-                matrix.append(row_cells)
-
-        def matches(row_cells: List[str]) -> bool:
-            for col_data in wanted:
-                if exact_match:
-                    if not any(cell.lower() == col_data.lower() for cell in row_cells):
-                        return False
-                else:
-                    if not any(col_data.lower() in cell.lower() for cell in row_cells):
-                        return False
-            return True
-
-        # emulate TS behavior: find all matches, prevent matching same row twice
-        for _ in range(len(matrix)):
-            idx = next((i for i, row_cells in enumerate(matrix) if matches(row_cells)), -1)
-            if idx >= 0:
-                found_indices.append(idx)
-                matrix[idx] = []  # clear to avoid matching again
-            else:
-                break
-
-        return found_indices
+    def iter_table_rows(
+        self,
+        locator: str = "tr",
+        batch_size: int = 50,
+        scroll_container: Optional[str] = None,
+        next_page_locator: Optional[str] = None,
+        row_key_attribute: str = "aria-rowindex",
+        max_pages: int = 0,
+        settle_timeout: int = 250,
+    ) -> Iterator[List[List[str]]]:
+        """
+        Yield the td texts of a virtualized and/or paginated grid in batches,
+        loading more rows only when the caller asks for the next batch.
+
+        - scroll_container: element that is scrolled one viewport at a time
+          until it does not move any more (virtualized grids)
+        - next_page_locator: "next page" control clicked when the current page
+          is exhausted, until it is missing or disabled (paginated grids)
+        - row_key_attribute: identifies rows that stay rendered between
+          scrolls; rows without it are identified by their cell texts, so
+          identical rows within one page are only yielded once
+        - max_pages: stop after this many pages (0 = no limit)
+
+        Stop iterating (break) as soon as you have what you need.
+        """
+        pages = 0
+        while True:
+            pages += 1
+            seen: Set[Any] = set()
+            batch: List[List[str]] = []
+            while True:
+                for row in self.page.locator(locator).evaluate_all(_VISIBLE_ROWS_JS, row_key_attribute):
+                    key = row["key"] if row["key"] is not None else tuple(row["cells"])
+                    if key in seen:
+                        continue
+                    seen.add(key)
+                    batch.append(row["cells"])
+                    if len(batch) == batch_size:
+                        yield batch
+                        batch = []
+
+                if scroll_container is None:
+                    break
+                if not self.page.locator(scroll_container).evaluate(_SCROLL_ONE_PAGE_JS):
+                    break
+                self.page.wait_for_timeout(settle_timeout)
+
+            if batch:
+                yield batch
+
+            if next_page_locator is None or (max_pages and pages >= max_pages):
+                return
+            next_button = self.page.locator(next_page_locator).first
+            if next_button.count() == 0 or not next_button.is_enabled():
+                return
+            next_button.click()
+            self.page.wait_for_load_state()
+            self.page.wait_for_timeout(settle_timeout)
+
+    def find_row_streaming(
+        self,
+        row_values: List[str],
+        locator: str = "tr",
+        exact_match: bool = False,
+        **iter_options: Any,
+    ) -> Optional[Tuple[int, List[str]]]:
+        """
+        Return (position in the stream, cells) of the first row matching all
+        row_values, or None. Reads the grid with iter_table_rows (same
+        options) and stops scrolling/paginating at the first match.
+        """
+        wanted = self._normalize_values(row_values)
+        position = 0
+        for batch in self.iter_table_rows(locator, **iter_options):
+            rows = Table_Index(batch).matching_rows(wanted, exact_match)
+            if rows:
+                return position + rows[0], batch[rows[0]]
+            position += len(batch)
+        return None
 
     def is_exist(self, root: Locator, selector: str) -> bool:
         """Return True if at least one element exists under root."""
@@ -15,4 +15,7 @@ class Login_Page(Base_Page):
     def login(self, email: str, password: str):
         self.page.locator(self.locators["email"]).fill(email)
         self.page.locator(self.locators["password"]).fill(password)
-        self.page.locator(self.locators["submit"]).click()
\ No newline at end of file
+        self.page.locator(self.locators["submit"]).click()
+
+    def is_login_form_visible(self) -> bool:
+        return self.page.locator(self.locators["email"]).is_visible()
\ No newline at end of file
@@ -0,0 +1,273 @@
+"""
+Parallel scenario runner.
+
+Shards the scenarios found under the behave ``paths`` across N worker
+processes. Every worker is a normal behave run (same environment.py hooks,
+its own sync_playwright() instance and browser) that writes its reports and
+artifacts to ``<output>/worker-<n>/``. When all workers are done the results
+are merged back into the usual locations:
+
+    reports/allure/          Allure results of all workers
+    reports/behave_report.json
+    screenshots/, traces/, videos/
+    test_log.log
+    test_log.jsonl           with -D log_format=json, merged in time order
+    <each --json-log file>   per-worker logs of configure_logger(json_lines=True)
+
+Usage:
+    python src/parallel_runner.py --workers 4
+    python src/parallel_runner.py --workers 8 --mode duration -- -D profile=uat --tags @regression
+
+Everything after ``--`` is passed to behave unchanged.
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import shutil
+import subprocess
+import sys
+from pathlib import Path
+from typing import Any, Dict, List, Sequence, Tuple
+
+from utils.json_logging import merge_json_logs, worker_log_files
+
+ARTIFACT_DIRS = ("screenshots", "traces", "videos")
+DEFAULT_DURATIONS_FILE = "reports/scenario_durations.json"
+
+
+def discover_scenarios(behave_args: List[str]) -> List[Tuple[str, List[str]]]:
+    """
+    Return (location, tags) for every scenario behave would select.
+
+    behave.ini defaults (paths, default_tags) and --tags from behave_args are
+    applied through behave's own Configuration, so the shards only contain
+    scenarios that will actually run.
+    """
+    from behave.parser import parse_file
+
+    config = load_behave_config(behave_args)
+    feature_files: List[str] = []
+    for path in config.paths:
+        path = path.split(":")[0]
+        if os.path.isdir(path):
+            for root, _, files in os.walk(path):
+                feature_files.extend(os.path.join(root, f) for f in sorted(files) if f.endswith(".feature"))
+        elif path.endswith(".feature"):
+            feature_files.append(path)
+
+    scenarios: List[Tuple[str, List[str]]] = []
+    for filename in sorted(set(os.path.relpath(f) for f in feature_files)):
+        feature = parse_file(filename)
+        if feature is None:
+            continue
+        for scenario in feature.walk_scenarios():
+            tags = list(scenario.effective_tags)
+            if config.tags.check(tags):
+                scenarios.append((str(scenario.location), tags))
+    return scenarios
+
+
+def load_durations(durations_file: str) -> Dict[str, float]:
+    """Load historical scenario durations (location -> seconds)."""
+    if not os.path.exists(durations_file):
+        return {}
+    with open(durations_file, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def shard_round_robin(locations: List[str], workers: int) -> List[List[str]]:
+    """Split locations into `workers` shards in discovery order."""
+    shards: List[List[str]] = [[] for _ in range(workers)]
+    for i, location in enumerate(locations):
+        shards[i % workers].append(location)
+    return shards
+
+
+def shard_by_duration(locations: List[str], workers: int, durations: Dict[str, float]) -> List[List[str]]:
+    """
+    Longest-processing-time-first scheduling.
+
+    Scenarios are sorted by their last known duration (unknown ones get the
+    average) and each one goes to the currently least loaded worker.
+    """
+    known = [durations[loc] for loc in locations if loc in durations]
+    default = sum(known) / len(known) if known else 0.0
+
+    shards: List[List[str]] = [[] for _ in range(workers)]
+    loads = [0.0] * workers
+    for location in sorted(locations, key=lambda loc: durations.get(loc, default), reverse=True):
+        target = loads.index(min(loads))
+        shards[target].append(location)
+        loads[target] += durations.get(location, default)
+    return shards
+
+
+def worker_command(worker_id: int, worker_dir: str, locations: List[str], behave_args: List[str]) -> List[str]:
+    """Build the command line of one worker process."""
+    return [
+        sys.executable, os.path.abspath(__file__), "--worker", "--",
+        *locations,
+        "-D", f"worker_id={worker_id}",
+        "-D", f"artifacts_dir={worker_dir}",
+        "-f", "json", "-o", os.path.join(worker_dir, "behave_report.json"),
+        "-f", "allure_behave.formatter:AllureFormatter", "-o", os.path.join(worker_dir, "allure"),
+        *behave_args,
+    ]
+
+
+def load_behave_config(behave_args: List[str]):
+    """
+    Build a behave Configuration from behave.ini plus behave_args.
+
+    The format/outfiles defaults from behave.ini are dropped: every worker
+    would otherwise write the same reports/behave_report.html.
+    """
+    from behave.configuration import Configuration, load_configuration
+
+    defaults = Configuration.defaults.copy()
+    load_configuration(defaults)
+    defaults.pop("format", None)
+    defaults.pop("outfiles", None)
+    return Configuration(behave_args, load_config=False, **defaults)
+
+
+def run_worker(behave_args: List[str]) -> int:
+    """Entry point of a worker process: a plain behave run."""
+    from behave.__main__ import run_behave
+
+    return run_behave(load_behave_config(behave_args))
+
+
+def _move_tree(source: Path, destination: Path) -> None:
+    """Move every file below source into destination (overwriting)."""
+    if not source.is_dir():
+        return
+    destination.mkdir(parents=True, exist_ok=True)
+    for item in source.iterdir():
+        target = destination / item.name
+        if item.is_dir():
+            _move_tree(item, target)
+        else:
+            shutil.move(str(item), str(target))
+
+
+def scenario_durations(report: List[Dict[str, Any]]) -> Dict[str, float]:
+    """Collect location -> duration (sum of step durations) from a behave json report."""
+    durations: Dict[str, float] = {}
+    for feature in report:
+        for element in feature.get("elements", []):
+            if element.get("type") != "scenario":
+                continue
+            total = sum(step.get("result", {}).get("duration", 0.0) for step in element.get("steps", []))
+            durations[element["location"]] = total
+    return durations
+
+
+def merge_results(worker_dirs: List[str], allure_dir: str, durations_file: str, json_logs: Sequence[str] = ()) -> None:
+    """Merge the reports, logs and artifacts of all workers into one run."""
+    merged_report: List[Dict[str, Any]] = []
+    durations = load_durations(durations_file)
+
+    with open("test_log.log", "w", encoding="utf-8") as log_out:
+        for worker_dir in worker_dirs:
+            wdir = Path(worker_dir)
+
+            report_file = wdir / "behave_report.json"
+            if report_file.exists() and report_file.stat().st_size > 0:
+                with report_file.open("r", encoding="utf-8") as f:
+                    report = json.load(f)
+                merged_report.extend(report)
+                durations.update(scenario_durations(report))
+
+            _move_tree(wdir / "allure", Path(allure_dir))
+            for name in ARTIFACT_DIRS:
+                _move_tree(wdir / name, Path(name))
+
+            log_file = wdir / "test_log.log"
+            if log_file.exists():
+                log_out.write(log_file.read_text(encoding="utf-8"))
+
+    worker_json_logs = [str(Path(d) / "test_log.jsonl") for d in worker_dirs if (Path(d) / "test_log.jsonl").exists()]
+    if worker_json_logs:
+        merge_json_logs(worker_json_logs, "test_log.jsonl")
+    for log_file in json_logs:
+        worker_files = worker_log_files(log_file)
+        if worker_files:
+            merge_json_logs(worker_files, log_file)
+
+    Path("reports").mkdir(parents=True, exist_ok=True)
+    with open(os.path.join("reports", "behave_report.json"), "w", encoding="utf-8") as f:
+        json.dump(merged_report, f, indent=2)
+
+    Path(durations_file).parent.mkdir(parents=True, exist_ok=True)
+    with open(durations_file, "w", encoding="utf-8") as f:
+        json.dump(durations, f, indent=2, sort_keys=True)
+
+
+def parse_args(argv: List[str]) -> Tuple[argparse.Namespace, List[str]]:
+    parser = argparse.ArgumentParser(description="Run behave scenarios in parallel worker processes.")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1,
+                        help="number of worker processes (default: CPU count)")
+    parser.add_argument("--mode", choices=("round-robin", "duration"), default="duration",
+                        help="sharding strategy; 'duration' uses historical durations longest-first")
+    parser.add_argument("--durations-file", default=DEFAULT_DURATIONS_FILE,
+                        help="historical scenario durations, updated after every run")
+    parser.add_argument("--output", default="reports/parallel", help="folder for per-worker results")
+    parser.add_argument("--allure-dir", default="reports/allure", help="merged Allure results folder")
+    parser.add_argument("--json-log", action="append", default=[], metavar="FILE",
+                        help="merge the per-worker files of a configure_logger(json_lines=True) log into FILE "
+                             "(e.g. logs/test.jsonl); repeatable")
+    parser.add_argument("--worker", action="store_true", help=argparse.SUPPRESS)
+
+    if "--" in argv:
+        split = argv.index("--")
+        own_args, behave_args = argv[:split], argv[split + 1:]
+    else:
+        own_args, behave_args = argv, []
+    return parser.parse_args(own_args), behave_args
+
+
+def main(argv: List[str] = None) -> int:
+    args, behave_args = parse_args(sys.argv[1:] if argv is None else argv)
+    if args.worker:
+        return run_worker(behave_args)
+
+    locations = [location for location, _ in discover_scenarios(behave_args)]
+    if not locations:
+        print("No scenarios selected.")
+        return 0
+
+    workers = max(1, min(args.workers, len(locations)))
+    if args.mode == "duration":
+        shards = shard_by_duration(locations, workers, load_durations(args.durations_file))
+    else:
+        shards = shard_round_robin(locations, workers)
+
+    shutil.rmtree(args.output, ignore_errors=True)
+    for log_file in args.json_log:
+        # worker files are appended to; drop the ones of the previous run
+        for stale in worker_log_files(log_file):
+            os.remove(stale)
+    processes = []
+    worker_dirs = []
+    for worker_id, shard in enumerate(shards):
+        worker_dir = os.path.join(args.output, f"worker-{worker_id}")
+        os.makedirs(worker_dir, exist_ok=True)
+        worker_dirs.append(worker_dir)
+        print(f"Worker {worker_id}: {len(shard)} scenario(s)")
+        processes.append(subprocess.Popen(worker_command(worker_id, worker_dir, shard, behave_args)))
+
+    exit_codes = [p.wait() for p in processes]
+    merge_results(worker_dirs, args.allure_dir, args.durations_file, args.json_log)
+
+    failed = [i for i, code in enumerate(exit_codes) if code != 0]
+    if failed:
+        print(f"Workers with failures: {failed}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,78 @@
+# artifact_writer.py
+import logging
+import os
+import queue
+import threading
+import time
+from typing import Any, Callable
+
+
+class ArtifactWriter:
+    """
+    Writes test artifacts (screenshot files, videos) on a background thread
+    so file I/O overlaps with the next browser actions.
+
+    Tasks are kept in a bounded queue: submit() blocks while the queue is
+    full, so a slow disk throttles the test thread instead of letting the
+    backlog grow without limit. flush() waits until every queued task is done.
+    Playwright objects are not thread-safe, so tasks must only do file I/O on
+    data captured by the test thread. Allure calls stay on the test thread:
+    an attachment made here would land on whatever Allure step or test is
+    open when the task runs, and the reporter is not thread-safe.
+    """
+
+    def __init__(self, max_queue_size: int = 64):
+        self._queue: "queue.Queue[Any]" = queue.Queue(maxsize=max_queue_size)
+        self._thread = threading.Thread(target=self._run, name="artifact-writer", daemon=True)
+        self._thread.start()
+        self.completed = 0
+        self.failed = 0
+        self.blocked_seconds = 0.0
+
+    def submit(self, task: Callable[..., Any], *args: Any, **kwargs: Any) -> None:
+        """Queue task(*args, **kwargs); blocks while the queue is full."""
+        try:
+            self._queue.put_nowait((task, args, kwargs))
+        except queue.Full:
+            started = time.perf_counter()
+            self._queue.put((task, args, kwargs))
+            self.blocked_seconds += time.perf_counter() - started
+
+    def write_bytes(self, path: str, data: bytes) -> None:
+        """Queue writing data to path."""
+        self.submit(_write_bytes, path, data)
+
+    def rename(self, source: str, destination: str) -> None:
+        """Queue renaming source to destination."""
+        self.submit(os.rename, source, destination)
+
+    def flush(self) -> None:
+        """Block until all queued tasks have finished."""
+        self._queue.join()
+
+    def close(self) -> None:
+        """Flush pending tasks and stop the writer thread."""
+        self.flush()
+        self._queue.put(None)
+        self._thread.join()
+
+    def _run(self) -> None:
+        while True:
+            item = self._queue.get()
+            try:
+                if item is None:
+                    return
+                task, args, kwargs = item
+                task(*args, **kwargs)
+                self.completed += 1
+            except Exception as e:
+                self.failed += 1
+                logging.error(f"Artifact task failed: {e}")
+            finally:
+                self._queue.task_done()
+
+
+def _write_bytes(path: str, data: bytes) -> None:
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    with open(path, "wb") as f:
+        f.write(data)
@@ -0,0 +1,87 @@
+# auth_state_utils.py
+import json
+import os
+import re
+import time
+from pathlib import Path
+from typing import Callable, Dict, Tuple
+
+
+class StorageStateCache:
+    """
+    Caches Playwright storage_state files per (profile, user).
+
+    The UI login runs once, its storage state is saved to
+    <folder>/<profile>-<user>.json and reused by later scenarios (and by
+    other workers, since the cache lives on disk). A cached state is
+    considered stale when it is older than `ttl_seconds` or when one of its
+    cookies has expired. invalidate() does not delete the shared file (other
+    workers may be about to use it); the next login replaces it atomically.
+    """
+
+    def __init__(self, folder: str = ".auth", ttl_seconds: int = 1800):
+        self.folder = folder
+        self.ttl_seconds = ttl_seconds
+        self._known_valid: Dict[Tuple[str, str], float] = {}
+        # mtime of state files this process found expired (see invalidate)
+        self._invalidated: Dict[Tuple[str, str], float] = {}
+
+    def path_for(self, profile: str, user: str) -> str:
+        safe_user = re.sub(r"[^A-Za-z0-9_.-]", "_", user)
+        return str(Path(self.folder) / f"{profile}-{safe_user}.json")
+
+    def get(self, profile: str, user: str, login: Callable[[str], None]) -> str:
+        """
+        Return the storage state path for profile/user, calling login(path)
+        to create it first when there is no valid cached state.
+        """
+        path = self.path_for(profile, user)
+        saved_at = self._known_valid.get((profile, user))
+        if saved_at is not None and time.time() - saved_at < self.ttl_seconds and os.path.exists(path):
+            return path
+
+        if not self.is_valid(path) or self._mtime(path) == self._invalidated.get((profile, user)):
+            Path(self.folder).mkdir(parents=True, exist_ok=True)
+            tmp_path = f"{path}.{os.getpid()}.tmp"
+            login(tmp_path)
+            os.replace(tmp_path, path)
+
+        self._known_valid[(profile, user)] = os.path.getmtime(path)
+        self._invalidated.pop((profile, user), None)
+        return path
+
+    @staticmethod
+    def _mtime(path: str) -> float:
+        try:
+            return os.path.getmtime(path)
+        except FileNotFoundError:
+            return -1.0
+
+    def is_valid(self, path: str) -> bool:
+        """True if the state file exists, is within the TTL and has no expired cookies."""
+        if not os.path.exists(path):
+            return False
+        if time.time() - os.path.getmtime(path) >= self.ttl_seconds:
+            return False
+
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                state = json.load(f)
+        except (OSError, ValueError):
+            return False
+
+        now = time.time()
+        for cookie in state.get("cookies", []):
+            expires = cookie.get("expires", -1)
+            # -1 marks a session cookie
+            if expires != -1 and expires < now:
+                return False
+        return True
+
+    def invalidate(self, profile: str, user: str) -> None:
+        """
+        Forget the cached state so the next get() logs in again, unless
+        another worker has already replaced the file with a newer state.
+        """
+        self._known_valid.pop((profile, user), None)
+        self._invalidated[(profile, user)] = self._mtime(self.path_for(profile, user))
@@ -0,0 +1,143 @@
+# context_pool.py
+import logging
+from typing import Any, Dict, List, Set
+from urllib.parse import urlsplit
+
+from playwright.sync_api import Browser, BrowserContext, Frame, Page
+
+
+# Run on a blank page of each origin the context visited
+_CLEAR_ORIGIN_STORAGE = """async () => {
+    localStorage.clear();
+    sessionStorage.clear();
+    if (indexedDB.databases) {
+        for (const db of await indexedDB.databases()) {
+            await new Promise(done => {
+                const request = indexedDB.deleteDatabase(db.name);
+                request.onsuccess = request.onerror = request.onblocked = done;
+            });
+        }
+    }
+    if (window.caches) {
+        for (const key of await caches.keys()) await caches.delete(key);
+    }
+    if (navigator.serviceWorker) {
+        for (const registration of await navigator.serviceWorker.getRegistrations()) await registration.unregister();
+    }
+}"""
+
+
+class ContextPool:
+    """
+    Bounded pool of warm BrowserContexts.
+
+    A released context is reset and kept for the next scenario instead of
+    being closed: pages are closed, cookies and permissions cleared, and for
+    every origin any of its pages or frames navigated to (including pages
+    closed during the scenario) local/session storage, IndexedDB, Cache
+    Storage and service workers are cleared on a blank page of that origin
+    (requests are fulfilled locally, the application is not loaded). A
+    context that was still tracing has its trace discarded. At most
+    `max_size` idle contexts are kept; contexts that fail to reset are
+    closed and not reused.
+    """
+
+    def __init__(self, browser: Browser, context_options: Dict[str, Any], max_size: int = 1):
+        self.browser = browser
+        self.context_options = context_options
+        self.max_size = max_size
+        self._idle: List[BrowserContext] = []
+        self._origins: Dict[BrowserContext, Set[str]] = {}
+        self._resetting: Set[BrowserContext] = set()
+        self.hits = 0
+        self.misses = 0
+        self.discarded = 0
+
+    def acquire(self) -> BrowserContext:
+        """Return an idle context if there is one, otherwise a new one."""
+        if self._idle:
+            self.hits += 1
+            return self._idle.pop()
+        self.misses += 1
+        browser_context = self.browser.new_context(**self.context_options)
+        self._track_origins(browser_context)
+        return browser_context
+
+    def release(self, browser_context: BrowserContext, tracing: bool = False) -> None:
+        """
+        Reset the context and put it back in the pool (or close it when the pool is full).
+        tracing=True: tracing was not stopped (e.g. after_scenario failed); it is stopped
+        without saving, and the context is closed when that fails.
+        """
+        if tracing:
+            try:
+                browser_context.tracing.stop()
+            except Exception as e:
+                logging.error(f"Could not stop tracing of pooled context: {e}")
+                self.discarded += 1
+                self._close(browser_context)
+                return
+        if len(self._idle) >= self.max_size or not self._reset(browser_context):
+            self.discarded += 1
+            self._close(browser_context)
+            return
+        self._idle.append(browser_context)
+
+    def close(self) -> None:
+        """Close all idle contexts."""
+        while self._idle:
+            self._close(self._idle.pop())
+
+    def stats(self) -> Dict[str, int]:
+        return {"hits": self.hits, "misses": self.misses, "discarded": self.discarded}
+
+    def _track_origins(self, browser_context: BrowserContext) -> None:
+        """Record the origin of every navigation in the context's pages and frames."""
+        origins: Set[str] = set()
+        self._origins[browser_context] = origins
+
+        def on_frame_navigated(frame: Frame) -> None:
+            if browser_context in self._resetting:
+                return
+            url = urlsplit(frame.url)
+            if url.scheme in ("http", "https") and url.netloc:
+                origins.add(f"{url.scheme}://{url.netloc}")
+
+        def on_page(page: Page) -> None:
+            page.on("framenavigated", on_frame_navigated)
+
+        browser_context.on("page", on_page)
+
+    def _reset(self, browser_context: BrowserContext) -> bool:
+        try:
+            for page in browser_context.pages:
+                page.close()
+
+            origins = self._origins.get(browser_context, set())
+            if origins:
+                self._resetting.add(browser_context)
+                page = browser_context.new_page()
+                try:
+                    page.route("**/*", lambda route: route.fulfill(status=200, content_type="text/html", body="<html></html>"))
+                    for origin in sorted(origins):
+                        page.goto(f"{origin}/")
+                        page.evaluate(_CLEAR_ORIGIN_STORAGE)
+                finally:
+                    page.close()
+                    self._resetting.discard(browser_context)
+                origins.clear()
+
+            browser_context.clear_cookies()
+            browser_context.clear_permissions()
+            return True
+        except Exception as e:
+            logging.error(f"Could not reset pooled context: {e}")
+            return False
+
+    def _close(self, browser_context: BrowserContext) -> None:
+        self._origins.pop(browser_context, None)
+        self._resetting.discard(browser_context)
+        try:
+            browser_context.close()
+        except Exception as e:
+            logging.error(f"Could not close pooled context: {e}")
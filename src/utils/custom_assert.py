@@ -1,12 +1,87 @@
 
 from __future__ import annotations
 
-from typing import Any, Dict, List, Optional, Sequence, Union
+from collections import Counter
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional, Sequence, Union
 
 import test_context as context
 import logger_utils as logger  # rename to your actual logger module (e.g., import logger)
 
 
+@dataclass
+class AssertLogPolicy:
+    """
+    How assertion results are logged (the soft assertion entries are not affected).
+
+    - max_items: lists/tuples longer than this are logged as their first
+      max_items elements plus a "+N more" note (0 = no limit)
+    - max_value_length: longer value renderings are cut (0 = no limit)
+    - pass_mode: "line" logs every passing assertion, "count" only counts
+      them per assertion type and logs one summary line per scenario
+      (environment.py calls log_pass_counts in after_scenario), "off" neither
+    """
+    max_items: int = 50
+    max_value_length: int = 1000
+    pass_mode: str = "line"
+
+
+_policy = AssertLogPolicy()
+_pass_counts: Counter = Counter()
+
+
+def configure_assert_logging(
+    max_items: Optional[int] = None,
+    max_value_length: Optional[int] = None,
+    pass_mode: Optional[str] = None,
+) -> AssertLogPolicy:
+    """Change the logging policy (only the given settings) and return it."""
+    if max_items is not None:
+        _policy.max_items = max_items
+    if max_value_length is not None:
+        _policy.max_value_length = max_value_length
+    if pass_mode is not None:
+        if pass_mode not in ("line", "count", "off"):
+            raise ValueError(f"pass_mode must be 'line', 'count' or 'off', got {pass_mode!r}")
+        _policy.pass_mode = pass_mode
+    return _policy
+
+
+def get_pass_counts() -> Dict[str, int]:
+    return dict(_pass_counts)
+
+
+def log_pass_counts(reset: bool = True) -> None:
+    """Log one line with the passed assertions counted in pass_mode="count" (e.g. per scenario)."""
+    if _pass_counts:
+        summary = ", ".join(f"{kind}={count}" for kind, count in sorted(_pass_counts.items()))
+        logger.info(f"Passed assertions :: {sum(_pass_counts.values())} {{{summary}}}")
+    if reset:
+        _pass_counts.clear()
+
+
+def _fmt(value: Any) -> str:
+    """Render a value for a log line, applying the truncation policy."""
+    max_items = _policy.max_items
+    if max_items and isinstance(value, (list, tuple)) and len(value) > max_items:
+        text = f"{list(value[:max_items])} ... +{len(value) - max_items} more ({len(value)} items)"
+    else:
+        text = str(value)
+
+    max_length = _policy.max_value_length
+    if max_length and len(text) > max_length:
+        text = f"{text[:max_length]} ... ({len(text)} chars)"
+    return text
+
+
+def _log_pass(kind: str, build_message: Callable[[], str]) -> None:
+    """Log a passing assertion; the message is only built if it will be emitted."""
+    if _policy.pass_mode == "count":
+        _pass_counts[kind] += 1
+    elif _policy.pass_mode == "line" and logger.is_info_enabled():
+        logger.info(build_message())
+
+
 def _norm_string(val: Any, case_sensitive: bool) -> Any:
     """
     TS behavior:
@@ -63,9 +138,9 @@ def soft_assert(actual: Any, expected: Any, message: str, case_sensitive: bool =
         actual_n, expected_n = actual, expected
 
     if actual_n == expected_n:
-        logger.info(f"softAssert :: {message} {{Actual : [{actual_n}] - Expected [{expected_n}]}}")
+        _log_pass("softAssert", lambda: f"softAssert :: {message} {{Actual : [{_fmt(actual_n)}] - Expected [{_fmt(expected_n)}]}}")
     else:
-        logger.error(f"softAssert :: {message} {{Actual : [{actual_n}] - Expected [{expected_n}]}}")
+        logger.error(f"softAssert :: {message} {{Actual : [{_fmt(actual_n)}] - Expected [{_fmt(expected_n)}]}}")
         soft = _ensure_soft_list()
         soft.append({
             "softAssert": "Failed",
@@ -85,9 +160,9 @@ def soft_contains(actual: Any, expected: Any, message: str, case_sensitive: bool
 
     # TS expects .includes, so treat as string operation where possible
     if str(expected_n) in str(actual_n):
-        logger.info(f"softContains :: {message} {{String : [{actual_n}] - Substring [{expected_n}]}}")
+        _log_pass("softContains", lambda: f"softContains :: {message} {{String : [{_fmt(actual_n)}] - Substring [{_fmt(expected_n)}]}}")
     else:
-        logger.error(f"softContains :: {message} {{String : [{actual_n}] - Substring [{expected_n}]}}")
+        logger.error(f"softContains :: {message} {{String : [{_fmt(actual_n)}] - Substring [{_fmt(expected_n)}]}}")
         soft = _ensure_soft_list()
         soft.append({
             "softContains": "Failed",
@@ -103,9 +178,9 @@ def soft_not_contains(actual: Any, expected: Any, message: str, case_sensitive:
     expected_n = _norm_string(expected, case_sensitive)
 
     if str(expected_n) not in str(actual_n):
-        logger.info(f"softNotContains :: {message} {{String : [{actual_n}] - Substring [{expected_n}]}}")
+        _log_pass("softNotContains", lambda: f"softNotContains :: {message} {{String : [{_fmt(actual_n)}] - Substring [{_fmt(expected_n)}]}}")
     else:
-        logger.error(f"softNotContains :: {message} {{String : [{actual_n}] - Substring [{expected_n}]}}")
+        logger.error(f"softNotContains :: {message} {{String : [{_fmt(actual_n)}] - Substring [{_fmt(expected_n)}]}}")
         soft = _ensure_soft_list()
         soft.append({
             "softNotContains": "Failed",
@@ -116,6 +191,21 @@ def soft_not_contains(actual: Any, expected: Any, message: str, case_sensitive:
         })
 
 
+def _norm_elements(values: Any, case_sensitive: bool) -> List[str]:
+    """
+    Normalize every element on its own (str, trim, lower unless case_sensitive).
+    None elements are skipped. Replaces the TS join(',')/split(',') round trip,
+    which also split elements that contain a comma.
+    """
+    if values is None:
+        return []
+    if isinstance(values, str):
+        values = [values]
+    if case_sensitive:
+        return [str(v).strip() for v in values if v is not None]
+    return [str(v).strip().lower() for v in values if v is not None]
+
+
 def soft_contains_for_string_array(
     actual: List[str],
     expected: Any,
@@ -127,19 +217,15 @@ def soft_contains_for_string_array(
       actual = caseSensitive ? actual : actual.toString().toLowerCase().split(',')
       expected = caseSensitive ? expected.trim() : expected.toLowerCase().trim()
       if (actual.indexOf(expected) >= 0) pass else fail
+    Elements are normalized one by one (see _norm_elements).
     """
-    if case_sensitive:
-        actual_list = actual
-        expected_n = str(expected).strip()
-    else:
-        actual_list = ",".join(actual).lower().split(",")
-        actual_list = [x.strip() for x in actual_list if x is not None]
-        expected_n = str(expected).lower().strip()
+    actual_list = _norm_elements(actual, case_sensitive)
+    expected_n = _norm_string(str(expected), case_sensitive)
 
     if expected_n in actual_list:
-        logger.info(f"softContainsForStringArray :: {message} {{Array : [{actual_list}] - Element [{expected_n}]}}")
+        _log_pass("softContainsForStringArray", lambda: f"softContainsForStringArray :: {message} {{Array : [{_fmt(actual_list)}] - Element [{_fmt(expected_n)}]}}")
     else:
-        logger.error(f"softContainsForStringArray :: {message} {{Array : [{actual_list}] - Element [{expected_n}]}}")
+        logger.error(f"softContainsForStringArray :: {message} {{Array : [{_fmt(actual_list)}] - Element [{_fmt(expected_n)}]}}")
         soft = _ensure_soft_list()
         soft.append({
             "softContainsForStringArray": "Failed",
@@ -156,18 +242,13 @@ def soft_not_contains_for_string_array(
     message: str,
     case_sensitive: bool = False
 ) -> None:
-    if case_sensitive:
-        actual_list = actual
-        expected_n = str(expected).strip()
-    else:
-        actual_list = ",".join(actual).lower().split(",")
-        actual_list = [x.strip() for x in actual_list if x is not None]
-        expected_n = str(expected).lower().strip()
+    actual_list = _norm_elements(actual, case_sensitive)
+    expected_n = _norm_string(str(expected), case_sensitive)
 
     if expected_n not in actual_list:
-        logger.info(f"softNotContainsForStringArray :: {message} {{Array : [{actual_list}] - Element [{expected_n}]}}")
+        _log_pass("softNotContainsForStringArray", lambda: f"softNotContainsForStringArray :: {message} {{Array : [{_fmt(actual_list)}] - Element [{_fmt(expected_n)}]}}")
     else:
-        logger.error(f"softNotContainsForStringArray :: {message} {{Array : [{actual_list}] - Element [{expected_n}]}}")
+        logger.error(f"softNotContainsForStringArray :: {message} {{Array : [{_fmt(actual_list)}] - Element [{_fmt(expected_n)}]}}")
         soft = _ensure_soft_list()
         soft.append({
             "softNotContainsForStringArray": "Failed",
@@ -188,16 +269,33 @@ def soft_assert_compare_string_arrays(
     TS:
       diffVals = actual.filter(item => expected.indexOf(item) < 0);
       flag = (diffVals.length === 0);
-    Note: TS code ignores caseSensitive here; we keep same behavior by default.
-    If you want case-insensitive comparison, I can add it.
+
+    Passes when every actual element is in expected, as in TS, but elements
+    are normalized (trim, and lowercase unless case_sensitive; TS ignored
+    caseSensitive) and compared through hashed multisets instead of list
+    scans. A failure entry also has missing (expected, not in actual), extra
+    (actual, not in expected) and duplicates (repeated actual elements)
+    counts; missing and extra count every occurrence.
     """
-    diff_vals = [item for item in actual if item not in expected]
-    flag = (len(diff_vals) == 0)
+    # raw and normalized elements pair up 1:1 (a str is one element)
+    actual_items = [actual] if isinstance(actual, str) else [a for a in actual or () if a is not None]
+    actual_n = _norm_elements(actual_items, case_sensitive)
+    expected_counts = Counter(_norm_elements(expected, case_sensitive))
+    actual_counts = Counter(actual_n)
+
+    extra = [value for value in actual_counts if value not in expected_counts]
+    flag = (len(extra) == 0)
 
     if flag:
-        logger.info(f"softAssertCompareArrays :: {message} {{Actual : [{actual}] - Expected  [{expected}]}}")
+        _log_pass("softAssertCompareArrays", lambda: f"softAssertCompareArrays :: {message} {{Actual : [{_fmt(actual)}] - Expected  [{_fmt(expected)}]}}")
     else:
-        logger.error(f"softAssertCompareArrays :: {message} {{Actual : [{actual}] - Expected  [{expected}]}}")
+        extra_set = set(extra)
+        # original (not normalized) values, in actual order, like TS diffVals
+        diff_vals = [item for item, norm in zip(actual_items, actual_n) if norm in extra_set]
+        missing = sum(count for value, count in expected_counts.items() if value not in actual_counts)
+        duplicates = sum(count - 1 for count in actual_counts.values() if count > 1)
+
+        logger.error(f"softAssertCompareArrays :: {message} {{Actual : [{_fmt(actual)}] - Expected  [{_fmt(expected)}]}}")
         soft = _ensure_soft_list()
         soft.append({
             "softAssertCompareArrays": "Failed",
@@ -206,6 +304,9 @@ def soft_assert_compare_string_arrays(
             "Expected": str(expected),
             "message": str(message),
             "differnce": f"[{diff_vals}]",
+            "missing": missing,
+            "extra": len(diff_vals),
+            "duplicates": duplicates,
         })
 
 
@@ -216,19 +317,15 @@ def soft_contains_one_of_them(
     case_sensitive: bool = False
 ) -> None:
     actual_n = _norm_string(actual, case_sensitive)
+    expected_list = _norm_elements(expected, case_sensitive)
 
-    if case_sensitive:
-        expected_list = expected
-    else:
-        expected_list = ",".join(expected).lower().split(",")
-        expected_list = [e.strip() for e in expected_list]
-
-    flag = any(e.strip() in str(actual_n) for e in expected_list if e is not None)
+    actual_text = str(actual_n)
+    flag = any(e in actual_text for e in expected_list)
 
     if flag:
-        logger.info(f"softContainsOneOfThem :: {message} {{Actual : [{actual_n}] - Expected One of Them [{expected_list}]}}")
+        _log_pass("softContainsOneOfThem", lambda: f"softContainsOneOfThem :: {message} {{Actual : [{_fmt(actual_n)}] - Expected One of Them [{_fmt(expected_list)}]}}")
     else:
-        logger.error(f"softContainsOneOfThem :: {message} {{Actual : [{actual_n}] - Expected One of Them [{expected_list}]}}")
+        logger.error(f"softContainsOneOfThem :: {message} {{Actual : [{_fmt(actual_n)}] - Expected One of Them [{_fmt(expected_list)}]}}")
         soft = _ensure_soft_list()
         soft.append({
             "softContainsOneOfThem": "Failed",
@@ -246,17 +343,13 @@ def soft_not_contains_one_of_them(
     case_sensitive: bool = False
 ) -> None:
     actual_n = _norm_string(actual, case_sensitive)
+    expected_list = _norm_elements(expected, case_sensitive)
 
-    if case_sensitive:
-        expected_list = expected
-    else:
-        expected_list = ",".join(expected).lower().split(",")
-        expected_list = [e.strip() for e in expected_list]
-
-    flag = any(e.strip() in str(actual_n) for e in expected_list if e is not None)
+    actual_text = str(actual_n)
+    flag = any(e in actual_text for e in expected_list)
 
     if flag:
-        logger.error(f"softNotContainsOneOfThem :: {message} {{Actual : [{actual_n}] - Expected One of Them [{expected_list}]}}")
+        logger.error(f"softNotContainsOneOfThem :: {message} {{Actual : [{_fmt(actual_n)}] - Expected One of Them [{_fmt(expected_list)}]}}")
         soft = _ensure_soft_list()
         soft.append({
             "softNotContainsOneOfThem": "Failed",
@@ -266,7 +359,199 @@ def soft_not_contains_one_of_them(
             "message": str(message),
         })
     else:
-        logger.info(f"softNotContainsOneOfThem :: {message} {{Actual : [{actual_n}] - Expected One of Them [{expected_list}]}}")
+        _log_pass("softNotContainsOneOfThem", lambda: f"softNotContainsOneOfThem :: {message} {{Actual : [{_fmt(actual_n)}] - Expected One of Them [{_fmt(expected_list)}]}}")
+
+
+# -----------------------------
+# Bulk (table) soft assertion
+# -----------------------------
+
+@dataclass
+class CellDiff:
+    row: Any        # key tuple (key_columns) or row index
+    column: Any
+    actual: Any
+    expected: Any
+
+
+@dataclass
+class TableDiff:
+    """Result of soft_assert_table. Rows are identified by key tuple, or by index without key_columns."""
+    compared_rows: int = 0
+    missing_rows: List[Any] = field(default_factory=list)    # expected, not found in actual
+    extra_rows: List[Any] = field(default_factory=list)      # in actual, not expected
+    # key used by more than one row of that side
+    duplicate_actual_keys: List[Any] = field(default_factory=list)
+    duplicate_expected_keys: List[Any] = field(default_factory=list)
+    cell_diffs: List[CellDiff] = field(default_factory=list)
+
+    @property
+    def ok(self) -> bool:
+        return not (
+            self.missing_rows or self.extra_rows or self.duplicate_actual_keys
+            or self.duplicate_expected_keys or self.cell_diffs
+        )
+
+    def summary(self) -> str:
+        return (
+            f"{self.compared_rows} row(s) compared, {len(self.cell_diffs)} cell diff(s), "
+            f"{len(self.missing_rows)} missing, {len(self.extra_rows)} extra, "
+            f"{len(self.duplicate_actual_keys)} duplicate actual key(s), "
+            f"{len(self.duplicate_expected_keys)} duplicate expected key(s)"
+        )
+
+
+def _as_records(table: Any, column_map: Optional[Dict[Any, Any]] = None) -> List[Dict[Any, Any]]:
+    """
+    Records from a list of dicts (e.g. query_result["json"]), a list of rows
+    (columns are the cell indexes) or an object with headers/rows
+    (e.g. Table_Snapshot, columns are the header texts).
+    column_map renames columns ({name in table: new name}).
+    """
+    if hasattr(table, "headers") and hasattr(table, "rows"):
+        headers = list(table.headers)
+        records = [dict(zip(headers, row)) for row in table.rows]
+    else:
+        records = [row if isinstance(row, dict) else dict(enumerate(row)) for row in table]
+    if column_map:
+        records = [{column_map.get(col, col): value for col, value in record.items()} for record in records]
+    return records
+
+
+def _check_columns(side: str, records: List[Dict[Any, Any]], columns: List[Any]) -> None:
+    """Raise when compared columns do not exist in any record of a (non-empty) table."""
+    if not records:
+        return
+    available = set()
+    for record in records:
+        available.update(record.keys())
+    absent = [col for col in columns if col not in available]
+    if absent:
+        raise ValueError(
+            f"soft_assert_table: column(s) {absent} not found in the {side} table "
+            f"(its columns: {sorted(available, key=str)}); map them with column_map"
+        )
+
+
+def soft_assert_table(
+    actual: Any,
+    expected: Any,
+    message: str,
+    key_columns: Optional[Sequence[Any]] = None,
+    columns: Optional[Sequence[Any]] = None,
+    case_sensitive: bool = False,
+    trim: bool = True,
+    max_diffs: int = 50,
+    column_map: Optional[Dict[Any, Any]] = None,
+) -> TableDiff:
+    """
+    Compare two whole tables/record lists in one call (e.g. a UI grid with DB rows).
+
+    - key_columns: match rows on these columns (order-independent);
+      without them rows are matched by position
+    - columns: columns to compare (default: the columns of the first expected
+      record); values are compared as text, None as ''
+    - column_map: {actual column: expected column}, e.g. grid header texts to
+      DB column names; key_columns and columns use the expected names
+    - case_sensitive / trim: normalization of every value
+
+    Raises ValueError when a compared column is missing from either table
+    (e.g. unmapped grid headers), instead of reporting every cell as None.
+
+    One log line and, on failure, one aggregated soft entry with the counts
+    and the first max_diffs differences are recorded. Returns the TableDiff.
+    """
+    actual_records = _as_records(actual, column_map)
+    expected_records = _as_records(expected)
+    if columns is None:
+        first = expected_records[0] if expected_records else (actual_records[0] if actual_records else {})
+        columns = list(first.keys())
+    columns = list(columns)
+    used_columns = columns + [col for col in key_columns or () if col not in columns]
+    _check_columns("actual", actual_records, used_columns)
+    _check_columns("expected", expected_records, used_columns)
+
+    def norm(value: Any) -> str:
+        text = "" if value is None else str(value)
+        if trim:
+            text = text.strip()
+        return text if case_sensitive else text.lower()
+
+    def normalized(records: List[Dict[Any, Any]]) -> List[List[str]]:
+        return [[norm(record.get(col)) for col in columns] for record in records]
+
+    actual_rows = normalized(actual_records)
+    expected_rows = normalized(expected_records)
+    diff = TableDiff()
+
+    if key_columns:
+        key_positions = [columns.index(col) if col in columns else None for col in key_columns]
+
+        def index_by_key(records: List[Dict[Any, Any]], rows: List[List[str]], duplicates: List[Any]) -> Dict[tuple, int]:
+            by_key: Dict[tuple, int] = {}
+            for i, (record, row) in enumerate(zip(records, rows)):
+                key = tuple(row[pos] if pos is not None else norm(record.get(col))
+                            for pos, col in zip(key_positions, key_columns))
+                if key in by_key:
+                    duplicates.append(key)
+                else:
+                    by_key[key] = i
+            return by_key
+
+        actual_by_key = index_by_key(actual_records, actual_rows, diff.duplicate_actual_keys)
+        expected_by_key = index_by_key(expected_records, expected_rows, diff.duplicate_expected_keys)
+        pairs = []
+        for key, e in expected_by_key.items():
+            a = actual_by_key.get(key)
+            if a is None:
+                diff.missing_rows.append(key)
+            else:
+                pairs.append((key, a, e))
+        diff.extra_rows = [key for key in actual_by_key if key not in expected_by_key]
+    else:
+        common = min(len(actual_rows), len(expected_rows))
+        pairs = [(i, i, i) for i in range(common)]
+        diff.missing_rows = list(range(common, len(expected_rows)))
+        diff.extra_rows = list(range(common, len(actual_rows)))
+
+    for row_id, a, e in pairs:
+        actual_row, expected_row = actual_rows[a], expected_rows[e]
+        if actual_row != expected_row:
+            for c, col in enumerate(columns):
+                if actual_row[c] != expected_row[c]:
+                    diff.cell_diffs.append(CellDiff(
+                        row_id, col, actual_records[a].get(col), expected_records[e].get(col)
+                    ))
+    diff.compared_rows = len(pairs)
+
+    if diff.ok:
+        _log_pass("softAssertTable", lambda: f"softAssertTable :: {message} {{{diff.summary()}}}")
+        return diff
+
+    differences: List[str] = []
+    differences += [f"row {row}: missing" for row in diff.missing_rows[:max_diffs]]
+    differences += [f"row {row}: extra" for row in diff.extra_rows[:max_diffs - len(differences)]]
+    differences += [f"key {key}: duplicate in actual" for key in diff.duplicate_actual_keys[:max_diffs - len(differences)]]
+    differences += [f"key {key}: duplicate in expected" for key in diff.duplicate_expected_keys[:max_diffs - len(differences)]]
+    differences += [
+        f"row {d.row}, column {d.column}: Actual [{d.actual}] - Expected [{d.expected}]"
+        for d in diff.cell_diffs[:max_diffs - len(differences)]
+    ]
+    logger.error(f"softAssertTable :: {message} {{{diff.summary()}}} {_fmt(differences)}")
+    _ensure_soft_list().append({
+        "softAssertTable": "Failed",
+        "caseSensitive": str(case_sensitive),
+        "message": str(message),
+        "summary": diff.summary(),
+        "comparedRows": diff.compared_rows,
+        "missingRows": len(diff.missing_rows),
+        "extraRows": len(diff.extra_rows),
+        "duplicateActualKeys": len(diff.duplicate_actual_keys),
+        "duplicateExpectedKeys": len(diff.duplicate_expected_keys),
+        "cellDiffs": len(diff.cell_diffs),
+        "differences": differences,
+    })
+    return diff
 
 
 # -----------------------------
@@ -275,23 +560,23 @@ def soft_not_contains_one_of_them(
 
 def hard_assert(actual: Any, expected: Any, message: str) -> None:
     if actual == expected:
-        logger.info(f"hardAssert :: {message} {{Actual : [{actual}] - Expected [{expected}]}}")
+        _log_pass("hardAssert", lambda: f"hardAssert :: {message} {{Actual : [{_fmt(actual)}] - Expected [{_fmt(expected)}]}}")
     else:
-        logger.error(f"hardAssert :: {message} {{Actual : [{actual}] - Expected [{expected}]}}")
+        logger.error(f"hardAssert :: {message} {{Actual : [{_fmt(actual)}] - Expected [{_fmt(expected)}]}}")
         raise AssertionError(f"hardAssert :: {message} {{Actual : [{actual}] - Expected [{expected}]}}")
 
 
 def hard_contains(actual: str, expected: str, message: str) -> None:
     if expected in actual:
-        logger.info(f"hardContains :: {message} {{Actual : [{actual}] - Expected [{expected}]}}")
+        _log_pass("hardContains", lambda: f"hardContains :: {message} {{Actual : [{_fmt(actual)}] - Expected [{_fmt(expected)}]}}")
     else:
-        logger.error(f"hardContains :: {message} {{Actual : [{actual}] - Expected [{expected}]}}")
+        logger.error(f"hardContains :: {message} {{Actual : [{_fmt(actual)}] - Expected [{_fmt(expected)}]}}")
         raise AssertionError(f"hardContains :: {message} {{Actual : [{actual}] - Expected [{expected}]}}")
 
 
 def hard_not_contains(actual: str, expected: str, message: str) -> None:
     if expected not in actual:
-        logger.info(f"hardNotContains :: {message} {{String : [{actual}] - Substring [{expected}]}}")
+        _log_pass("hardNotContains", lambda: f"hardNotContains :: {message} {{String : [{_fmt(actual)}] - Substring [{_fmt(expected)}]}}")
     else:
-        logger.error(f"hardNotContains :: {message} {{String : [{actual}] - Substring [{expected}]}}")
+        logger.error(f"hardNotContains :: {message} {{String : [{_fmt(actual)}] - Substring [{_fmt(expected)}]}}")
         raise AssertionError(f"hardNotContains :: {message}\n{{Actual : [{actual}] - Expected [{expected}]}}")
@@ -0,0 +1,97 @@
+# db_cache.py
+import sys
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, List, Optional, Tuple
+
+
+def _estimate_size(rows: List[tuple], meta_data: List[Dict[str, Any]]) -> int:
+    """Rough in-memory size of a result in bytes (containers + values, shallow per value)."""
+    size = sys.getsizeof(rows) + sys.getsizeof(meta_data)
+    for row in rows:
+        size += sys.getsizeof(row)
+        for value in row:
+            size += sys.getsizeof(value)
+    return size
+
+
+class QueryResultCache:
+    """
+    In-process cache of SELECT results (rows + metaData) for DataBaseUtils.
+
+    Entries expire after ttl_seconds and the least recently used entries are
+    evicted when there are more than max_entries or their estimated size is
+    above max_bytes. Results larger than max_bytes are never cached.
+    Thread-safe.
+    """
+
+    def __init__(self, ttl_seconds: float = 300.0, max_entries: int = 256, max_bytes: int = 64 * 1024 * 1024):
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._entries: "OrderedDict[Hashable, Tuple[float, int, List[tuple], List[Dict[str, Any]]]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def get(self, key: Hashable) -> Optional[Tuple[List[tuple], List[Dict[str, Any]]]]:
+        """(rows, metaData) for key, or None on a miss. Returns copies of the lists."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and time.monotonic() >= entry[0]:
+                self._remove(key)
+                self.expirations += 1
+                entry = None
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return list(entry[2]), [dict(m) for m in entry[3]]
+
+    def put(self, key: Hashable, rows: List[tuple], meta_data: List[Dict[str, Any]]) -> None:
+        size = _estimate_size(rows, meta_data)
+        if size > self.max_bytes:
+            return
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+            self._entries[key] = (time.monotonic() + self.ttl_seconds, size, list(rows), [dict(m) for m in meta_data])
+            self.bytes += size
+            while len(self._entries) > self.max_entries or self.bytes > self.max_bytes:
+                self._remove(next(iter(self._entries)))
+                self.evictions += 1
+
+    def invalidate(self, key: Optional[Hashable] = None) -> None:
+        """Drop one entry, or everything when key is None."""
+        with self._lock:
+            if key is None:
+                self._entries.clear()
+                self.bytes = 0
+            elif key in self._entries:
+                self._remove(key)
+
+    def _remove(self, key: Hashable) -> None:
+        entry = self._entries.pop(key)
+        self.bytes -= entry[1]
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "bytes": self.bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_ratio": self.hits / lookups if lookups else 0.0,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+            }
+
+
+# Shared by every DataBaseUtils in the process (unless one is given its own cache)
+query_cache = QueryResultCache()
@@ -0,0 +1,310 @@
+# db_pool.py
+import logging
+import queue
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterator, Optional, Tuple
+
+
+class PoolTimeout(Exception):
+    """No connection became available within the pool timeout."""
+
+
+class _PoolMetrics:
+    """Checkout counters shared by both pool types."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.checkouts = 0
+        self.wait_seconds = 0.0
+        self.max_wait_seconds = 0.0
+        self.failed_health_checks = 0
+
+    def record_wait(self, seconds: float) -> None:
+        with self._lock:
+            self.checkouts += 1
+            self.wait_seconds += seconds
+            self.max_wait_seconds = max(self.max_wait_seconds, seconds)
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {
+            "checkouts": self.checkouts,
+            "wait_seconds": self.wait_seconds,
+            "max_wait_seconds": self.max_wait_seconds,
+            "avg_wait_seconds": self.wait_seconds / self.checkouts if self.checkouts else 0.0,
+            "failed_health_checks": self.failed_health_checks,
+        }
+
+
+class ConnectionPool:
+    """
+    Generic thread-safe connection pool (used for MySQL).
+
+    Keeps up to max_size connections created by connect(); min_size of them
+    are opened up front. acquire() waits up to `timeout` seconds when all
+    connections are in use. With a health_check, idle connections are
+    checked on checkout and replaced when the check fails. reset(conn) runs
+    when a connection is returned (e.g. rollback, so the next user does not
+    inherit an open transaction); if it fails the connection is discarded.
+    """
+
+    def __init__(
+        self,
+        connect: Callable[[], Any],
+        min_size: int = 1,
+        max_size: int = 4,
+        timeout: float = 30.0,
+        health_check: Optional[Callable[[Any], bool]] = None,
+        reset: Optional[Callable[[Any], None]] = None,
+    ):
+        self._connect = connect
+        self._reset = reset
+        self.max_size = max(1, max_size)
+        self.timeout = timeout
+        self._health_check = health_check
+        self._idle: "queue.LifoQueue[Any]" = queue.LifoQueue()
+        self._lock = threading.Lock()
+        self._size = 0
+        self._closed = False
+        self.metrics = _PoolMetrics()
+        self.created = 0
+        self.discarded = 0
+
+        for _ in range(min(max(0, min_size), self.max_size)):
+            self._idle.put(self._new_connection())
+
+    def _new_connection(self) -> Any:
+        with self._lock:
+            self._size += 1
+        try:
+            conn = self._connect()
+        except BaseException:
+            with self._lock:
+                self._size -= 1
+            raise
+        self.created += 1
+        return conn
+
+    def _discard(self, conn: Any) -> None:
+        with self._lock:
+            self._size -= 1
+        self.discarded += 1
+        try:
+            conn.close()
+        except Exception as e:
+            logging.debug(f"Closing a discarded connection failed: {e}")
+
+    def _is_healthy(self, conn: Any) -> bool:
+        if self._health_check is None:
+            return True
+        try:
+            return bool(self._health_check(conn))
+        except Exception:
+            return False
+
+    def acquire(self) -> Any:
+        """Check out a connection, opening a new one while below max_size."""
+        if self._closed:
+            raise RuntimeError("Connection pool is closed")
+
+        started = time.perf_counter()
+        deadline = started + self.timeout
+        while True:
+            try:
+                conn = self._idle.get_nowait()
+            except queue.Empty:
+                with self._lock:
+                    can_open = self._size < self.max_size
+                if can_open:
+                    conn = self._new_connection()
+                    self.metrics.record_wait(time.perf_counter() - started)
+                    return conn
+                remaining = deadline - time.perf_counter()
+                if remaining <= 0:
+                    raise PoolTimeout(f"No connection available after {self.timeout}s (max_size={self.max_size})")
+                try:
+                    conn = self._idle.get(timeout=remaining)
+                except queue.Empty:
+                    continue
+
+            if self._is_healthy(conn):
+                self.metrics.record_wait(time.perf_counter() - started)
+                return conn
+            self.metrics.failed_health_checks += 1
+            self._discard(conn)
+
+    def release(self, conn: Any, discard: bool = False) -> None:
+        """Return a connection; discard=True closes it instead (e.g. after a connection error)."""
+        if not discard and self._reset is not None:
+            try:
+                self._reset(conn)
+            except Exception:
+                discard = True
+        if discard or self._closed:
+            self._discard(conn)
+        else:
+            self._idle.put(conn)
+
+    @contextmanager
+    def connection(self) -> Iterator[Any]:
+        conn = self.acquire()
+        try:
+            yield conn
+        except GeneratorExit:
+            # a streaming caller stopped early; the connection itself is fine
+            self.release(conn)
+            raise
+        except BaseException:
+            # the connection may be in an unknown state (open transaction, lost link)
+            self.release(conn, discard=True)
+            raise
+        self.release(conn)
+
+    def close(self) -> None:
+        """Close idle connections; connections still checked out are closed on release."""
+        self._closed = True
+        while True:
+            try:
+                self._discard(self._idle.get_nowait())
+            except queue.Empty:
+                break
+
+    def stats(self) -> Dict[str, Any]:
+        stats = self.metrics.as_dict()
+        stats.update({
+            "size": self._size,
+            "idle": self._idle.qsize(),
+            "in_use": self._size - self._idle.qsize(),
+            "created": self.created,
+            "discarded": self.discarded,
+        })
+        return stats
+
+
+class OraclePool:
+    """
+    Wrapper around oracledb.create_pool with the same interface as
+    ConnectionPool. Health checks are done by the driver: with
+    health_check=True every checkout pings the connection (ping_interval=0).
+    """
+
+    def __init__(
+        self,
+        oracledb: Any,
+        db_config: Dict[str, Any],
+        min_size: int = 1,
+        max_size: int = 4,
+        timeout: float = 30.0,
+        health_check: bool = True,
+    ):
+        self.max_size = max(1, max_size)
+        self.metrics = _PoolMetrics()
+        self._pool = oracledb.create_pool(
+            min=min(max(0, min_size), self.max_size),
+            max=self.max_size,
+            increment=1,
+            getmode=oracledb.POOL_GETMODE_TIMEDWAIT,
+            wait_timeout=int(timeout * 1000),
+            ping_interval=0 if health_check else -1,
+            **db_config,
+        )
+
+    def acquire(self) -> Any:
+        started = time.perf_counter()
+        conn = self._pool.acquire()
+        self.metrics.record_wait(time.perf_counter() - started)
+        return conn
+
+    def release(self, conn: Any, discard: bool = False) -> None:
+        if discard:
+            self._pool.drop(conn)
+        else:
+            self._pool.release(conn)
+
+    @contextmanager
+    def connection(self) -> Iterator[Any]:
+        conn = self.acquire()
+        try:
+            yield conn
+        except GeneratorExit:
+            self.release(conn)
+            raise
+        except BaseException:
+            self.release(conn, discard=True)
+            raise
+        self.release(conn)
+
+    def close(self) -> None:
+        self._pool.close(force=True)
+
+    def stats(self) -> Dict[str, Any]:
+        stats = self.metrics.as_dict()
+        stats.update({
+            "size": self._pool.opened,
+            "in_use": self._pool.busy,
+            "idle": self._pool.opened - self._pool.busy,
+        })
+        return stats
+
+
+# One pool per (db_type, db_config) in this process
+_pools: Dict[Tuple[str, str], Any] = {}
+_pools_lock = threading.Lock()
+
+# Worker threads for DataBaseUtils.execute_select_cmd_async
+_executor: Optional[ThreadPoolExecutor] = None
+_executor_lock = threading.Lock()
+EXECUTOR_MAX_WORKERS = 8
+
+
+def get_executor() -> ThreadPoolExecutor:
+    """Thread pool shared by the async DataBaseUtils calls (created on first use)."""
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(max_workers=EXECUTOR_MAX_WORKERS, thread_name_prefix="db-query")
+        return _executor
+
+
+def pool_key_for(db_type: str, db_config: Dict[str, Any]) -> Tuple[str, str]:
+    """Identity of a db_type/db_config pair (also used by the query result cache)."""
+    return db_type, repr(sorted(db_config.items()))
+
+
+def get_pool(db_type: str, db_config: Dict[str, Any], create: Callable[[], Any]) -> Any:
+    """Return the pool shared for db_type/db_config, calling create() the first time."""
+    key = pool_key_for(db_type, db_config)
+    with _pools_lock:
+        pool = _pools.get(key)
+        if pool is None:
+            pool = create()
+            _pools[key] = pool
+        return pool
+
+
+def pool_stats() -> Dict[str, Dict[str, Any]]:
+    """Stats of every open pool, keyed by db type and pool number."""
+    with _pools_lock:
+        return {f"{key[0]}#{i}": pool.stats() for i, (key, pool) in enumerate(_pools.items())}
+
+
+def close_all_pools() -> Dict[str, Dict[str, Any]]:
+    """Close every pool and the query threads (call from after_all). Returns the final pool stats."""
+    global _executor
+    with _executor_lock:
+        executor, _executor = _executor, None
+    if executor is not None:
+        # wait for running and queued queries before their connections are closed;
+        # not under _pools_lock, queued queries still need it in get_pool()
+        executor.shutdown(wait=True)
+    with _pools_lock:
+        stats = {f"{key[0]}#{i}": pool.stats() for i, (key, pool) in enumerate(_pools.items())}
+        for pool in _pools.values():
+            try:
+                pool.close()
+            except Exception as e:
+                logging.warning(f"Closing a database pool failed: {e}")
+        _pools.clear()
+    return stats
@@ -1,7 +1,40 @@
 
 from __future__ import annotations
 
-from typing import Any, Dict, List, Optional, Sequence, Union
+import asyncio
+import copy
+import itertools
+from concurrent.futures import Future
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple, Union, overload
+
+import db_cache as dbCache
+import db_pool as dbPool
+
+
+@dataclass
+class BatchError:
+    """A failed execute_many batch (or the failed rows of a batch, Oracle batcherrors)."""
+    batch_index: int
+    start_row: int
+    row_count: int
+    message: str
+    # (row number in the whole input, error) for row-level errors
+    row_errors: List[Tuple[int, str]] = field(default_factory=list)
+
+
+@dataclass
+class BulkResult:
+    total_rows: int = 0
+    rows_written: int = 0
+    batches: int = 0
+    committed_batches: int = 0
+    errors: List[BatchError] = field(default_factory=list)
+
+    @property
+    def ok(self) -> bool:
+        return not self.errors
 
 
 class DataBaseUtils:
@@ -14,14 +47,42 @@ class DataBaseUtils:
         - rows: list of row tuples
         - metaData: list of dicts with at least {"name": <colname>}
         - json: list[dict] (only when casesync=False for Oracle, like TS)
+    - pooled: when True, connections come from a pool shared by every
+      DataBaseUtils with the same db_type/db_config in the process
+      (oracledb.create_pool for Oracle, db_pool.ConnectionPool for MySQL)
+      instead of connect/close per query. Close them with
+      db_pool.close_all_pools() (environment.py does it in after_all).
+    - cache_results: when True, SELECT results are kept in a
+      db_cache.QueryResultCache (the process-wide db_cache.query_cache unless
+      result_cache is given), keyed on db_type, db_config, query and params.
+      Meant for reference data; execute_select_cmd(use_cache=False) bypasses it.
     """
 
-    def __init__(self, db_type: str, db_config: Optional[Dict[str, Any]] = None):
+    def __init__(
+        self,
+        db_type: str,
+        db_config: Optional[Dict[str, Any]] = None,
+        *,
+        pooled: bool = False,
+        pool_min_size: int = 1,
+        pool_max_size: int = 4,
+        pool_timeout: float = 30.0,
+        pool_health_check: bool = True,
+        cache_results: bool = False,
+        result_cache: Optional[dbCache.QueryResultCache] = None,
+    ):
         self.db_conn: Any = None  # underlying connection object
         self.conn: Any = None     # kept for parity with TS; not strictly required
         self.db_type: str = db_type
         self.db_config: Dict[str, Any] = db_config or {}
         self.query_result: Optional[Dict[str, Any]] = None
+        self.pooled = pooled
+        self.pool_min_size = pool_min_size
+        self.pool_max_size = pool_max_size
+        self.pool_timeout = pool_timeout
+        self.pool_health_check = pool_health_check
+        self.cache_results = cache_results
+        self.result_cache = result_cache if result_cache is not None else dbCache.query_cache
 
     def set_db_type(self, db_type: str) -> None:
         self.db_type = db_type
@@ -35,6 +96,8 @@ class DataBaseUtils:
         params: Optional[Union[Sequence[Any], Dict[str, Any]]] = None,
         *,
         casesync: bool = False,
+        lazy_json: bool = False,
+        use_cache: Optional[bool] = None,
     ) -> Dict[str, Any]:
         """
         Execute a SELECT query and return a query_result dict.
@@ -43,18 +106,165 @@ class DataBaseUtils:
             query: SQL query string
             params: optional bind params (tuple/list for positional or dict for named)
             casesync: if False, also populate query_result["json"] (Oracle behavior parity)
+            lazy_json: if True, query_result["json"] is a read-only RowDictView
+                that builds each dict on access instead of a second full copy of the rows
+            use_cache: override cache_results for this query (False = always hit the database)
 
         Returns:
             query_result dict with "rows", "metaData", and possibly "json".
         """
         dbt = (self.db_type or "").lower().strip()
+        if dbt not in ("oracle", "mysql"):
+            return self._execute_unsupported_select(dbt)
+
+        cache_key = None
+        if self.cache_results if use_cache is None else use_cache:
+            cache_key = (dbt, dbPool.pool_key_for(dbt, self.db_config), query, repr(params))
+            cached = self.result_cache.get(cache_key)
+            if cached is not None:
+                rows, meta = cached
+                self.query_result = {"rows": rows, "metaData": meta}
+                # same shape as the uncached paths: Oracle skips json when casesync
+                if dbt == "mysql" or not casesync:
+                    self.query_result["json"] = RowDictView(rows, meta) if lazy_json else self._results_to_json(rows, meta)
+                return self.query_result
 
         if dbt == "oracle":
-            return self._execute_oracle_select(query, params=params, casesync=casesync)
+            result = self._execute_oracle_select(query, params=params, casesync=casesync, lazy_json=lazy_json)
+        else:
+            result = self._execute_mysql_select(query, params=params, lazy_json=lazy_json)
 
-        if dbt == "mysql":
-            return self._execute_mysql_select(query, params=params)
+        if cache_key is not None:
+            self.result_cache.put(cache_key, result["rows"], result["metaData"])
+        return result
+
+    def execute_select_cmd_async(
+        self,
+        query: str,
+        params: Optional[Union[Sequence[Any], Dict[str, Any]]] = None,
+        **kwargs: Any,
+    ) -> "Future[Dict[str, Any]]":
+        """
+        Run execute_select_cmd on a background thread (db_pool.get_executor())
+        and return a Future with the query_result, so the test thread can keep
+        driving the browser. Takes the same keyword arguments.
 
+        The query runs on a copy of this object: self.query_result is not
+        updated, read the result from the Future.
+        """
+        worker = copy.copy(self)
+        worker.query_result = None
+        return dbPool.get_executor().submit(worker.execute_select_cmd, query, params, **kwargs)
+
+    async def execute_select_cmd_aio(
+        self,
+        query: str,
+        params: Optional[Union[Sequence[Any], Dict[str, Any]]] = None,
+        **kwargs: Any,
+    ) -> Dict[str, Any]:
+        """asyncio flavour of execute_select_cmd_async (awaitable result)."""
+        return await asyncio.wrap_future(self.execute_select_cmd_async(query, params, **kwargs))
+
+    def gather_selects(
+        self,
+        queries: Sequence[Union[str, Tuple[str, Any]]],
+        *,
+        timeout: Optional[float] = None,
+        **kwargs: Any,
+    ) -> List[Dict[str, Any]]:
+        """
+        Run independent SELECTs concurrently and return their query_results
+        in the same order. Each entry is a query string or (query, params).
+        The first failing query raises after all queries were started.
+        """
+        futures = []
+        for entry in queries:
+            query, params = (entry, None) if isinstance(entry, str) else entry
+            futures.append(self.execute_select_cmd_async(query, params, **kwargs))
+        return [future.result(timeout=timeout) for future in futures]
+
+    def execute_many(
+        self,
+        statement: str,
+        rows: Iterable[Union[Sequence[Any], Dict[str, Any]]],
+        *,
+        batch_size: int = 1000,
+        commit_per_batch: bool = True,
+        continue_on_error: bool = False,
+    ) -> BulkResult:
+        """
+        Bulk INSERT/UPDATE/DELETE with executemany (array binding), batch_size
+        rows per round trip. rows may be a generator; it is read batch by batch.
+
+        - commit_per_batch=True: each good batch is committed, a failed batch
+          is rolled back; otherwise everything is committed at the end, or
+          rolled back if any batch failed (rows_written is then 0)
+        - continue_on_error=False stops at the first failed batch
+        - Oracle uses batcherrors: bad rows are reported in row_errors while
+          the other rows of the batch are written
+
+        Errors are returned in BulkResult.errors, not raised, e.g. in before_all:
+
+            result = DataBaseUtils("oracle", cfg, pooled=True).execute_many(
+                "insert into members (id, name) values (:1, :2)", member_rows)
+            assert result.ok, result.errors
+        """
+        dbt = (self.db_type or "").lower().strip()
+        if dbt not in ("oracle", "mysql"):
+            self._execute_unsupported_select(dbt)
+
+        result = BulkResult()
+        row_iter = iter(rows)
+        with self._connection(self._connect_function()) as conn:
+            cur = conn.cursor()
+            try:
+                for batch_index in itertools.count():
+                    batch = list(itertools.islice(row_iter, batch_size))
+                    if not batch:
+                        break
+                    start_row = result.total_rows
+                    result.total_rows += len(batch)
+                    result.batches += 1
+
+                    try:
+                        if dbt == "oracle":
+                            cur.executemany(statement, batch, batcherrors=True)
+                            row_errors = [(start_row + e.offset, e.message) for e in cur.getbatcherrors()]
+                        else:
+                            cur.executemany(statement, batch)
+                            row_errors = []
+                    except Exception as err:
+                        if commit_per_batch:
+                            conn.rollback()
+                        result.errors.append(BatchError(batch_index, start_row, len(batch), str(err)))
+                        if continue_on_error:
+                            continue
+                        break
+
+                    result.rows_written += len(batch) - len(row_errors)
+                    if row_errors:
+                        result.errors.append(BatchError(
+                            batch_index, start_row, len(batch), f"{len(row_errors)} row(s) failed", row_errors
+                        ))
+                    if commit_per_batch:
+                        conn.commit()
+                        result.committed_batches += 1
+                    if row_errors and not continue_on_error:
+                        break
+
+                if not commit_per_batch:
+                    if result.errors:
+                        conn.rollback()
+                        result.rows_written = 0
+                    else:
+                        conn.commit()
+                        result.committed_batches = result.batches
+            finally:
+                cur.close()
+
+        return result
+
+    def _execute_unsupported_select(self, dbt: str) -> Dict[str, Any]:
         if dbt == "sql":
             # Your TS class constructor allows "sql" but code doesn't implement it.
             # You can implement using pyodbc or pymssql if needed.
@@ -65,6 +275,160 @@ class DataBaseUtils:
 
         raise ValueError(f"Unsupported db_type: {self.db_type!r}")
 
+    def iter_select(
+        self,
+        query: str,
+        params: Optional[Union[Sequence[Any], Dict[str, Any]]] = None,
+        *,
+        arraysize: int = 1000,
+        as_dict: bool = False,
+    ) -> Iterator[Any]:
+        """
+        Stream the rows of a SELECT query: rows are fetched with fetchmany()
+        in batches of `arraysize`, so only one batch is held in memory.
+        MySQL uses an unbuffered cursor (SSCursor with PyMySQL) so rows are
+        read from the server as they are fetched.
+
+        Yields row tuples, or dicts keyed by column name when as_dict=True.
+        The connection stays checked out until the iterator is exhausted or
+        closed (use contextlib.closing() when breaking out early). On an
+        early close the rest of a MySQL result is read and discarded, so the
+        connection can be reused; stopping early on a large MySQL result
+        therefore still costs the transfer of the remaining rows.
+        Does not set query_result.
+        """
+        for batch in self.iter_select_batches(query, params, arraysize=arraysize, as_dict=as_dict):
+            yield from batch
+
+    def iter_select_batches(
+        self,
+        query: str,
+        params: Optional[Union[Sequence[Any], Dict[str, Any]]] = None,
+        *,
+        arraysize: int = 1000,
+        as_dict: bool = False,
+    ) -> Iterator[List[Any]]:
+        """Like iter_select, but yields each fetchmany() batch as a list."""
+        with self._connection(self._connect_function()) as conn:
+            cur = self._streaming_cursor(conn)
+            try:
+                cur.arraysize = arraysize
+                if hasattr(cur, "prefetchrows"):
+                    # oracledb: fetch the first batch with the execute round trip
+                    cur.prefetchrows = arraysize + 1
+                if params is None:
+                    cur.execute(query)
+                else:
+                    cur.execute(query, params)
+
+                col_names = [d[0] for d in (cur.description or [])]
+                while True:
+                    rows = cur.fetchmany(arraysize)
+                    if not rows:
+                        break
+                    yield [dict(zip(col_names, row)) for row in rows] if as_dict else list(rows)
+            except GeneratorExit:
+                if self._is_mysql():
+                    # mysql-connector refuses to close a cursor with unread rows
+                    # ("Unread result found"); read the rest off the connection
+                    while cur.fetchmany(arraysize):
+                        pass
+                raise
+            finally:
+                cur.close()
+
+    def _is_mysql(self) -> bool:
+        return (self.db_type or "").lower().strip() == "mysql"
+
+    def _streaming_cursor(self, conn: Any) -> Any:
+        """Cursor that reads rows from the server as they are fetched."""
+        if not self._is_mysql():
+            return conn.cursor()
+        mysql_connector = self._import_mysql()
+        if mysql_connector.__name__ == "pymysql":
+            # PyMySQL's default Cursor reads the whole result in execute()
+            return conn.cursor(mysql_connector.cursors.SSCursor)
+        return conn.cursor(buffered=False)
+
+    # -----------------------------
+    # Connections (direct or pooled)
+    # -----------------------------
+    def _connect_function(self) -> Any:
+        dbt = (self.db_type or "").lower().strip()
+        if dbt == "oracle":
+            return self._import_oracledb().connect
+        if dbt == "mysql":
+            return self._import_mysql().connect
+        raise ValueError(f"Unsupported db_type: {self.db_type!r}")
+
+    @staticmethod
+    def _import_oracledb() -> Any:
+        try:
+            import oracledb  # python-oracledb
+        except ImportError as e:
+            raise ImportError(
+                "Missing dependency: 'oracledb'. Install with: pip install oracledb"
+            ) from e
+        return oracledb
+
+    @staticmethod
+    def _import_mysql() -> Any:
+        try:
+            import mysql.connector as mysql_connector  # mysql-connector-python
+        except ImportError:
+            try:
+                import pymysql as mysql_connector  # PyMySQL fallback
+            except ImportError as e:
+                raise ImportError(
+                    "Missing dependency: 'mysql-connector-python' or 'PyMySQL'. "
+                    "Install with: pip install mysql-connector-python pymysql"
+                ) from e
+        return mysql_connector
+
+    def get_pool(self) -> Any:
+        """Pool shared for this db_type/db_config (created on first use)."""
+        dbt = (self.db_type or "").lower().strip()
+        config = dict(self.db_config)
+
+        def create() -> Any:
+            if dbt == "oracle":
+                return dbPool.OraclePool(
+                    self._import_oracledb(),
+                    config,
+                    min_size=self.pool_min_size,
+                    max_size=self.pool_max_size,
+                    timeout=self.pool_timeout,
+                    health_check=self.pool_health_check,
+                )
+            if dbt == "mysql":
+                mysql_connector = self._import_mysql()
+                return dbPool.ConnectionPool(
+                    lambda: mysql_connector.connect(**config),
+                    min_size=self.pool_min_size,
+                    max_size=self.pool_max_size,
+                    timeout=self.pool_timeout,
+                    health_check=_mysql_ping if self.pool_health_check else None,
+                    # ends the read snapshot of the last query (REPEATABLE READ)
+                    reset=lambda conn: conn.rollback(),
+                )
+            raise ValueError(f"Pooling is not supported for db_type: {self.db_type!r}")
+
+        return dbPool.get_pool(dbt, config, create)
+
+    @contextmanager
+    def _connection(self, connect: Any) -> Iterator[Any]:
+        """A pooled connection, or a new one from connect() that is closed afterwards."""
+        if self.pooled:
+            with self.get_pool().connection() as conn:
+                yield conn
+            return
+
+        conn = connect(**self.db_config)
+        try:
+            yield conn
+        finally:
+            conn.close()
+
     # -----------------------------
     # Oracle implementation
     # -----------------------------
@@ -74,6 +438,7 @@ class DataBaseUtils:
         params: Optional[Union[Sequence[Any], Dict[str, Any]]] = None,
         *,
         casesync: bool,
+        lazy_json: bool = False,
     ) -> Dict[str, Any]:
         """
         Oracle select using python-oracledb.
@@ -83,26 +448,22 @@ class DataBaseUtils:
         Optional:
             config_dir, wallet_location, wallet_password, etc.
         """
-        try:
-            import oracledb  # python-oracledb
-        except ImportError as e:
-            raise ImportError(
-                "Missing dependency: 'oracledb'. Install with: pip install oracledb"
-            ) from e
+        oracledb = self._import_oracledb()
 
-        conn = None
-        cur = None
         try:
-            conn = oracledb.connect(**self.db_config)
-            cur = conn.cursor()
-            if params is None:
-                cur.execute(query)
-            else:
-                cur.execute(query, params)
-
-            rows = cur.fetchall()
-            # cur.description is list of tuples: (name, type_code, display_size, internal_size, precision, scale, null_ok)
-            meta = [{"name": d[0]} for d in (cur.description or [])]
+            with self._connection(oracledb.connect) as conn:
+                cur = conn.cursor()
+                try:
+                    if params is None:
+                        cur.execute(query)
+                    else:
+                        cur.execute(query, params)
+
+                    rows = cur.fetchall()
+                    # cur.description is list of tuples: (name, type_code, display_size, internal_size, precision, scale, null_ok)
+                    meta = [{"name": d[0]} for d in (cur.description or [])]
+                finally:
+                    cur.close()
 
             self.query_result = {
                 "rows": rows,
@@ -111,7 +472,7 @@ class DataBaseUtils:
 
             # Match your TS behavior: build JSON unless casesync is True
             if not casesync:
-                self.query_result["json"] = self._results_to_json(rows, meta)
+                self.query_result["json"] = RowDictView(rows, meta) if lazy_json else self._results_to_json(rows, meta)
 
             return self.query_result
 
@@ -119,14 +480,6 @@ class DataBaseUtils:
             # Match the "Ouch!" console log vibe but raise for caller visibility
             print("Ouch!", err)
             raise
-        finally:
-            # Always clean up
-            try:
-                if cur is not None:
-                    cur.close()
-            finally:
-                if conn is not None:
-                    conn.close()
 
     # -----------------------------
     # MySQL implementation
@@ -135,6 +488,8 @@ class DataBaseUtils:
         self,
         query: str,
         params: Optional[Union[Sequence[Any], Dict[str, Any]]] = None,
+        *,
+        lazy_json: bool = False,
     ) -> Dict[str, Any]:
         """
         MySQL select using mysql-connector-python.
@@ -142,50 +497,34 @@ class DataBaseUtils:
         Expected db_config keys commonly include:
             host, user, password, database, port
         """
-        try:
-            import mysql.connector as mysql_connector  # mysql-connector-python
-        except ImportError:
-            try:
-                import pymysql as mysql_connector  # PyMySQL fallback
-            except ImportError as e:
-                raise ImportError(
-                    "Missing dependency: 'mysql-connector-python' or 'PyMySQL'. "
-                    "Install with: pip install mysql-connector-python pymysql"
-                ) from e
+        mysql_connector = self._import_mysql()
 
-        conn = None
-        cur = None
         try:
-            conn = mysql.connector.connect(**self.db_config)
-            cur = conn.cursor()
-
-            if params is None:
-                cur.execute(query)
-            else:
-                cur.execute(query, params)
-
-            rows = cur.fetchall()
-            # cursor.description is tuples; name is index 0
-            meta = [{"name": d[0]} for d in (cur.description or [])]
+            with self._connection(mysql_connector.connect) as conn:
+                cur = conn.cursor()
+                try:
+                    if params is None:
+                        cur.execute(query)
+                    else:
+                        cur.execute(query, params)
+
+                    rows = cur.fetchall()
+                    # cursor.description is tuples; name is index 0
+                    meta = [{"name": d[0]} for d in (cur.description or [])]
+                finally:
+                    cur.close()
 
             self.query_result = {
                 "rows": rows,
                 "metaData": meta,
                 # TS mysql path returned rows directly, but we keep consistent structure
-                "json": self._results_to_json(rows, meta),
+                "json": RowDictView(rows, meta) if lazy_json else self._results_to_json(rows, meta),
             }
             return self.query_result
 
         except Exception as err:
             print("Ouch!", err)
             raise
-        finally:
-            try:
-                if cur is not None:
-                    cur.close()
-            finally:
-                if conn is not None:
-                    conn.close()
 
     # -----------------------------
     # Helper (like getResultsToJson)
@@ -203,3 +542,55 @@ class DataBaseUtils:
             item = {col_names[i]: row[i] for i in range(len(col_names))}
             result.append(item)
         return result
+
+
+class RowDictView(Sequence):
+    """
+    Read-only list-like view of query rows as dicts (lazy query_result["json"]).
+    Each dict is built when accessed, so the rows are not held twice.
+    Compares equal to the list _results_to_json would have built.
+    """
+
+    def __init__(self, rows: Sequence[tuple], meta_data: List[Dict[str, Any]]):
+        self._rows = rows
+        self._col_names = [m.get("name") for m in meta_data]
+
+    def __len__(self) -> int:
+        return len(self._rows)
+
+    @overload
+    def __getitem__(self, index: int) -> Dict[str, Any]: ...
+
+    @overload
+    def __getitem__(self, index: slice) -> List[Dict[str, Any]]: ...
+
+    def __getitem__(self, index: Any) -> Any:
+        if isinstance(index, slice):
+            return [self._to_dict(row) for row in self._rows[index]]
+        return self._to_dict(self._rows[index])
+
+    def __iter__(self) -> Iterator[Dict[str, Any]]:
+        for row in self._rows:
+            yield self._to_dict(row)
+
+    def __eq__(self, other: Any) -> bool:
+        if isinstance(other, (RowDictView, list)):
+            return len(self) == len(other) and all(a == b for a, b in zip(self, other))
+        return NotImplemented
+
+    def __repr__(self) -> str:
+        return f"RowDictView({len(self)} rows)"
+
+    def to_list(self) -> List[Dict[str, Any]]:
+        return list(self)
+
+    def _to_dict(self, row: tuple) -> Dict[str, Any]:
+        return {self._col_names[i]: row[i] for i in range(len(self._col_names))}
+
+
+def _mysql_ping(conn: Any) -> bool:
+    """Health check for pooled MySQL connections (mysql-connector and PyMySQL)."""
+    if hasattr(conn, "is_connected"):
+        return conn.is_connected()
+    conn.ping(reconnect=False)
+    return True
@@ -1,8 +1,10 @@
 
 import json
 import os
+import tempfile
+from contextlib import contextmanager
 from pathlib import Path
-from typing import Any, List
+from typing import Any, Callable, Iterator, List, Optional
 
 
 def check_folder_and_create(folder: str) -> None:
@@ -24,6 +26,57 @@ def write_json_data(file_path: str, data: Any) -> None:
         json.dump(data, f, indent=2, ensure_ascii=False)
 
 
+def write_json_data_atomic(file_path: str, data: Any) -> None:
+    """
+    Same output as write_json_data, but written to a temp file in the same
+    folder and renamed over file_path, so readers never see a partial file.
+    """
+    path = Path(file_path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=str(path.parent), prefix=f".{path.name}.", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump(data, f, indent=2, ensure_ascii=False)
+        os.replace(tmp_path, str(path))
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+
+@contextmanager
+def file_lock(file_path: str) -> Iterator[None]:
+    """
+    Exclusive inter-process lock for file_path (uses <file_path>.lock).
+    Blocks until the lock is available.
+    """
+    lock_path = f"{file_path}.lock"
+    Path(lock_path).parent.mkdir(parents=True, exist_ok=True)
+    with open(lock_path, "a+") as lock_file:
+        if os.name == "nt":
+            import msvcrt
+            lock_file.seek(0)
+            while True:
+                try:
+                    msvcrt.locking(lock_file.fileno(), msvcrt.LK_LOCK, 1)
+                    break
+                except OSError:
+                    # LK_LOCK gives up after ~10 seconds; keep waiting
+                    continue
+            try:
+                yield
+            finally:
+                lock_file.seek(0)
+                msvcrt.locking(lock_file.fileno(), msvcrt.LK_UNLCK, 1)
+        else:
+            import fcntl
+            fcntl.flock(lock_file.fileno(), fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(lock_file.fileno(), fcntl.LOCK_UN)
+
+
 def read_json_data(file_path: str) -> Any:
     """
     TS: JSON.parse(fs.readFileSync(filePath))
@@ -33,6 +86,133 @@ def read_json_data(file_path: str) -> Any:
         return json.load(f)
 
 
+_WHITESPACE = " \t\n\r"
+_NUMBER_CHARS = "0123456789.eE+-"
+
+
+class _JsonStream:
+    """Chunked text buffer for decoding one JSON value at a time with raw_decode."""
+
+    def __init__(self, f: Any, chunk_size: int):
+        self.f = f
+        self.chunk_size = chunk_size
+        self.buf = ""
+        self.pos = 0
+        self.eof = False
+
+    def _read_more(self, size: int) -> bool:
+        if self.eof:
+            return False
+        chunk = self.f.read(size)
+        if not chunk:
+            self.eof = True
+            return False
+        # drop the consumed part so memory stays bounded by the current value
+        self.buf = self.buf[self.pos:] + chunk
+        self.pos = 0
+        return True
+
+    def peek(self) -> str:
+        """Next non-whitespace character ('' at end of file)."""
+        while True:
+            while self.pos < len(self.buf) and self.buf[self.pos] in _WHITESPACE:
+                self.pos += 1
+            if self.pos < len(self.buf):
+                return self.buf[self.pos]
+            if not self._read_more(self.chunk_size):
+                return ""
+
+    def expect(self, chars: str) -> str:
+        ch = self.peek()
+        if not ch or ch not in chars:
+            raise ValueError(f"Invalid JSON: expected one of {chars!r}, got {ch or 'end of file'!r}")
+        self.pos += 1
+        return ch
+
+    def value(self, decoder: json.JSONDecoder) -> Any:
+        """Decode the next JSON value, reading more text until it is complete."""
+        self.peek()
+        size = self.chunk_size
+        while True:
+            try:
+                obj, end = decoder.raw_decode(self.buf, self.pos)
+                # a number cut by the chunk boundary decodes as a shorter number
+                complete = end < len(self.buf) and not (
+                    isinstance(obj, (int, float)) and self.buf[end] in _NUMBER_CHARS
+                )
+                if complete or self.eof:
+                    self.pos = end
+                    return obj
+            except json.JSONDecodeError:
+                if self.eof:
+                    raise
+            if not self._read_more(size):
+                continue
+            size *= 2
+
+
+def iter_json_array_items(
+    file_path: str,
+    key: Optional[str] = "testData",
+    predicate: Optional[Callable[[Any], bool]] = None,
+    chunk_size: int = 1 << 16,
+) -> Iterator[Any]:
+    """
+    Streams the elements of the top-level array `key` of a JSON file
+    (key=None: the file itself is an array), optionally filtered by predicate.
+    Only one element is decoded at a time, so memory stays bounded by the
+    largest element instead of the whole file. Other top-level values before
+    `key` are decoded and skipped; reading stops after the array.
+    """
+    decoder = json.JSONDecoder()
+    with Path(file_path).open("r", encoding="utf-8") as f:
+        stream = _JsonStream(f, chunk_size)
+
+        if key is not None:
+            stream.expect("{")
+            if stream.peek() == "}":
+                return
+            while True:
+                name = stream.value(decoder)
+                stream.expect(":")
+                if name == key and stream.peek() == "[":
+                    break
+                stream.value(decoder)
+                if stream.expect(",}") == "}":
+                    return
+
+        stream.expect("[")
+        if stream.peek() == "]":
+            return
+        while True:
+            item = stream.value(decoder)
+            if predicate is None or predicate(item):
+                yield item
+            if stream.expect(",]") == "]":
+                return
+
+
+def iter_ndjson(file_path: str, predicate: Optional[Callable[[Any], bool]] = None) -> Iterator[Any]:
+    """
+    Streams records of an NDJSON / JSON Lines file (one JSON value per line,
+    blank lines ignored), optionally filtered by predicate.
+    """
+    with Path(file_path).open("r", encoding="utf-8") as f:
+        for line_no, line in enumerate(f, start=1):
+            if not line.strip():
+                continue
+            try:
+                item = json.loads(line)
+            except json.JSONDecodeError as e:
+                raise ValueError(f"Invalid JSON on line {line_no} of {file_path}: {e}") from e
+            if predicate is None or predicate(item):
+                yield item
+
+
+def is_ndjson_file(file_path: str) -> bool:
+    return str(file_path).lower().endswith((".ndjson", ".jsonl"))
+
+
 def read_data(file_path: str) -> bytes:
     """
     TS: const data = fs.readFileSync(filePath); return data;
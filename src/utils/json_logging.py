@@ -0,0 +1,156 @@
+# json_logging.py
+import heapq
+import json
+import logging
+import sys
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Sequence
+
+
+# Correlation IDs of the scenario/step currently running (set by the behave hooks)
+_correlation: Dict[str, Any] = {
+    "worker": None,
+    "scenario_id": None,
+    "scenario": None,
+    "step_id": None,
+    "step": None,
+}
+
+
+def set_worker(worker_id: Optional[str]) -> None:
+    _correlation["worker"] = worker_id
+
+
+def current_worker() -> Optional[str]:
+    return _correlation["worker"]
+
+
+def set_scenario(scenario_id: Optional[str], name: Optional[str] = None) -> None:
+    """Tag following records with the scenario (clears the step)."""
+    _correlation.update(scenario_id=scenario_id, scenario=name, step_id=None, step=None)
+
+
+def set_step(step_id: Optional[str], name: Optional[str] = None) -> None:
+    _correlation.update(step_id=step_id, step=name)
+
+
+_factory_installed = False
+
+
+def install_correlation_ids() -> None:
+    """
+    Stamp every new LogRecord with the current worker/scenario/step IDs.
+    Done in the record factory, i.e. on the thread that logs, so the IDs are
+    right even when a QueueListener writes the record later.
+    """
+    global _factory_installed
+    if _factory_installed:
+        return
+    previous_factory = logging.getLogRecordFactory()
+
+    def factory(*args: Any, **kwargs: Any) -> logging.LogRecord:
+        record = previous_factory(*args, **kwargs)
+        for key, value in _correlation.items():
+            setattr(record, key, value)
+        return record
+
+    logging.setLogRecordFactory(factory)
+    _factory_installed = True
+
+
+class JsonLinesFormatter(logging.Formatter):
+    """
+    One JSON object per line:
+    {"ts": <epoch>, "time": <local ISO time>, "level", "logger", "worker",
+     "scenario_id", "scenario", "step_id", "step", "message"[, "exc"]}
+    Timestamps come from the record, not from the time it is written.
+    """
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "ts": record.created,
+            "time": datetime.fromtimestamp(record.created).isoformat(timespec="milliseconds"),
+            "level": record.levelname.lower(),
+            "logger": record.name,
+        }
+        for key in _correlation:
+            entry[key] = getattr(record, key, None)
+        entry["message"] = record.getMessage()
+        if record.exc_info:
+            entry["exc"] = self.formatException(record.exc_info)
+        elif record.exc_text:
+            entry["exc"] = record.exc_text
+        return json.dumps(entry, ensure_ascii=False, default=str)
+
+
+def json_file_handler(log_file: str) -> logging.FileHandler:
+    """FileHandler writing JSON lines with correlation IDs to log_file."""
+    install_correlation_ids()
+    Path(log_file).parent.mkdir(parents=True, exist_ok=True)
+    handler = logging.FileHandler(log_file, mode="a", encoding="utf-8")
+    handler.setFormatter(JsonLinesFormatter())
+    return handler
+
+
+def worker_log_file(log_file: str, worker_id: Optional[str] = None) -> str:
+    """
+    log_file with the worker ID before the suffix (logs/test.jsonl ->
+    logs/test.worker-2.jsonl), so parallel workers never share a file.
+    Unchanged when there is no worker (worker_id defaults to the current one).
+    """
+    worker_id = current_worker() if worker_id is None else worker_id
+    if worker_id is None:
+        return log_file
+    path = Path(log_file)
+    return str(path.with_name(f"{path.stem}.worker-{worker_id}{path.suffix}"))
+
+
+def worker_log_files(log_file: str) -> List[str]:
+    """Existing per-worker files of log_file (see worker_log_file)."""
+    path = Path(log_file)
+    return sorted(str(p) for p in path.parent.glob(f"{path.stem}.worker-*{path.suffix}"))
+
+
+def _read_entries(log_file: str) -> Iterator[Dict[str, Any]]:
+    with open(log_file, "r", encoding="utf-8") as f:
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                yield json.loads(line)
+            except json.JSONDecodeError:
+                # a line cut by a killed worker
+                continue
+
+
+def merge_json_logs(log_files: Sequence[str], output_file: str) -> int:
+    """
+    Merge per-worker JSON-lines logs into one time-ordered file.
+    Each input is already in time order (one writer per file), so this is a
+    streaming k-way merge. Returns the number of lines written.
+    """
+    Path(output_file).parent.mkdir(parents=True, exist_ok=True)
+    streams = [_read_entries(f) for f in log_files if Path(f).exists()]
+    count = 0
+    with open(output_file, "w", encoding="utf-8") as out:
+        for entry in heapq.merge(*streams, key=lambda e: e.get("ts", 0)):
+            out.write(json.dumps(entry, ensure_ascii=False) + "\n")
+            count += 1
+    return count
+
+
+def main(argv: List[str] = None) -> int:
+    """python src/utils/json_logging.py <output.jsonl> <worker log> [<worker log> ...]"""
+    args = sys.argv[1:] if argv is None else argv
+    if len(args) < 2:
+        print(main.__doc__)
+        return 2
+    count = merge_json_logs(args[1:], args[0])
+    print(f"Merged {count} log line(s) into {args[0]}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
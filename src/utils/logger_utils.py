@@ -4,9 +4,16 @@ import logging
 from dataclasses import dataclass
 from pathlib import Path
 from datetime import datetime
+from typing import Union
 
+import json_logging as jsonLogging
+import queue_logging as queueLogging
 import test_context as context
 
+# info()/error() print to the console unless configure_logger(queued=True)
+# added a console handler to the logger
+_print_to_console = True
+
 
 @dataclass
 class LoggerOptions:
@@ -23,17 +30,27 @@ class LocalTimeFormatter(logging.Formatter):
       format.printf(info => `[${new Date().toLocaleString()}] : ${info.level}: ${info.message}`)
     """
     def format(self, record: logging.LogRecord) -> str:
-        local_ts = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        # time of the log call, not of the write (records may be written later from a queue)
+        local_ts = datetime.fromtimestamp(record.created).strftime("%Y-%m-%d %H:%M:%S")
         level = record.levelname.lower()
         message = record.getMessage()
         return f"[{local_ts}] : {level}: {message}"
 
 
-def options(logger_options: LoggerOptions) -> dict:
+def options(logger_options: LoggerOptions, json_lines: bool = False) -> dict:
     """
     TS returned Winston 'options' object. In Python we return a dict describing config.
     (You can use configure_logger() below to apply it.)
+    json_lines=True: <file_name>.worker-<id>.jsonl (see json_logging.worker_log_file)
+    written with json_logging.JsonLinesFormatter.
     """
+    if json_lines:
+        log_path = Path(logger_options.logfile_folder) / f"{logger_options.file_name}.jsonl"
+        return {
+            "log_file": jsonLogging.worker_log_file(str(log_path)),
+            "level": logging.INFO,
+            "formatter": jsonLogging.JsonLinesFormatter(),
+        }
     log_path = Path(logger_options.logfile_folder) / f"{logger_options.file_name}.log"
     return {
         "log_file": str(log_path),
@@ -42,12 +59,34 @@ def options(logger_options: LoggerOptions) -> dict:
     }
 
 
-def configure_logger(logger_options: LoggerOptions, logger_name: str = "test") -> logging.Logger:
+def configure_logger(
+    logger_options: LoggerOptions,
+    logger_name: str = "test",
+    *,
+    queued: bool = False,
+    console_level: Union[str, int, None] = "INFO",
+    buffer_capacity: int = 1000,
+    json_lines: bool = False,
+) -> logging.Logger:
     """
     Creates/configures a logger to write to <logfileFolder>/<file_name>.log.
     Equivalent to Winston File transport with level 'info'.
+
+    queued=True: the logger only enqueues records (QueueHandler); a listener
+    thread writes them to a buffered file handler (buffer_capacity records,
+    errors flushed at once) and to the console from console_level up
+    (None/"off" = no console). info()/error() then stop printing themselves.
+    Call queue_logging.stop_queue_logging() at the end of the run to flush.
+
+    json_lines=True: JSON lines with worker/scenario/step IDs instead, one
+    file per parallel worker (<file_name>.worker-<id>.jsonl, or
+    <file_name>.jsonl outside parallel runs). parallel_runner.py --json-log
+    merges them into <file_name>.jsonl.
     """
-    cfg = options(logger_options)
+    global _print_to_console
+    cfg = options(logger_options, json_lines=json_lines)
+    if json_lines:
+        jsonLogging.install_correlation_ids()
 
     # Ensure folder exists
     Path(logger_options.logfile_folder).mkdir(parents=True, exist_ok=True)
@@ -56,9 +95,19 @@ def configure_logger(logger_options: LoggerOptions, logger_name: str = "test") -
     logger.setLevel(cfg["level"])
     logger.propagate = False  # avoid duplicate logs if root logger has handlers
 
+    if queued:
+        if not any(isinstance(h, queueLogging.QueueHandler) for h in logger.handlers):
+            handlers = [queueLogging.buffered_file_handler(cfg["log_file"], cfg["formatter"], buffer_capacity)]
+            console = queueLogging.console_handler(console_level)
+            if console is not None:
+                console.addFilter(queueLogging.ConsoleFilter())
+                handlers.append(console)
+            queueLogging.attach_queue(logger, handlers)
+        _print_to_console = False
+
     # Prevent adding multiple handlers if configure_logger called repeatedly
-    if not any(isinstance(h, logging.FileHandler) and getattr(h, "baseFilename", "") == cfg["log_file"]
-               for h in logger.handlers):
+    elif not any(isinstance(h, logging.FileHandler) and getattr(h, "baseFilename", "") == cfg["log_file"]
+                 for h in logger.handlers):
         file_handler = logging.FileHandler(cfg["log_file"], mode="a", encoding="utf-8")
         file_handler.setLevel(cfg["level"])
         file_handler.setFormatter(cfg["formatter"])
@@ -69,6 +118,13 @@ def configure_logger(logger_options: LoggerOptions, logger_name: str = "test") -
     return logger
 
 
+def is_info_enabled() -> bool:
+    """True if info() would write or print anything (callers can skip building the message)."""
+    if context.testContext is None or context.testContext.logger is None:
+        return True  # let info() raise its configuration error
+    return _print_to_console or context.testContext.logger.isEnabledFor(logging.INFO)
+
+
 def info(msg: str) -> None:
     """
     TS:
@@ -79,7 +135,7 @@ def info(msg: str) -> None:
         raise RuntimeError("testContext.logger is not configured. Call configure_logger() first.")
 
     context.testContext.logger.info(msg)
-    if "password" not in msg.lower():
+    if _print_to_console and "password" not in msg.lower():
         print(msg)
 
 
@@ -93,7 +149,8 @@ def error(msg: str) -> None:
         raise RuntimeError("testContext.logger is not configured. Call configure_logger() first.")
 
     context.testContext.logger.error(msg)
-    print(msg)
+    if _print_to_console:
+        print(msg)
 
 
 # ---- Optional: async wrappers (only for API parity) ----
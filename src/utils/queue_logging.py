@@ -0,0 +1,99 @@
+# queue_logging.py
+import atexit
+import logging
+import queue
+from logging.handlers import MemoryHandler, QueueHandler, QueueListener
+from typing import List, Optional, Sequence, Tuple, Union
+
+
+# Listeners started by attach_queue(), stopped by stop_queue_logging()
+_listeners: List[Tuple[logging.Logger, QueueHandler, QueueListener]] = []
+
+
+class ConsoleFilter(logging.Filter):
+    """
+    Console rule of logger_utils.info/error: info messages that mention a
+    password are not shown on the console (they still go to the file).
+    """
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        return record.levelno >= logging.ERROR or "password" not in record.getMessage().lower()
+
+
+def parse_level(level: Union[str, int, None]) -> Optional[int]:
+    """'INFO'/'warning'/20 -> level number; None, '' or 'off' -> None (disabled)."""
+    if level is None or isinstance(level, int):
+        return level
+    name = level.strip().upper()
+    if name in ("", "OFF", "NONE"):
+        return None
+    if name.isdigit():
+        return int(name)
+    value = logging.getLevelName(name)
+    if not isinstance(value, int):
+        raise ValueError(f"Unknown log level: {level!r}")
+    return value
+
+
+def buffered_file_handler(
+    log_file: str,
+    formatter: Optional[logging.Formatter] = None,
+    capacity: int = 1000,
+    flush_level: int = logging.ERROR,
+) -> MemoryHandler:
+    """
+    FileHandler behind a MemoryHandler: records are written in blocks of
+    `capacity`, or right away from flush_level up (errors are not delayed).
+    """
+    file_handler = logging.FileHandler(log_file, mode="a", encoding="utf-8")
+    if formatter is not None:
+        file_handler.setFormatter(formatter)
+    return buffered(file_handler, capacity, flush_level)
+
+
+def buffered(handler: logging.Handler, capacity: int = 1000, flush_level: int = logging.ERROR) -> MemoryHandler:
+    """Put a MemoryHandler in front of handler (see buffered_file_handler)."""
+    return MemoryHandler(capacity, flushLevel=flush_level, target=handler, flushOnClose=True)
+
+
+def console_handler(level: Union[str, int, None], formatter: Optional[logging.Formatter] = None) -> Optional[logging.Handler]:
+    """StreamHandler at the given level, or None when level disables the console."""
+    level = parse_level(level)
+    if level is None:
+        return None
+    handler = logging.StreamHandler()
+    handler.setLevel(level)
+    if formatter is not None:
+        handler.setFormatter(formatter)
+    return handler
+
+
+def attach_queue(logger: logging.Logger, handlers: Sequence[logging.Handler]) -> QueueListener:
+    """
+    Route logger through a QueueHandler: the calling thread only formats and
+    enqueues the record, a QueueListener thread does the writes to handlers.
+    """
+    log_queue: "queue.SimpleQueue[logging.LogRecord]" = queue.SimpleQueue()
+    listener = QueueListener(log_queue, *handlers, respect_handler_level=True)
+    listener.start()
+    queue_handler = QueueHandler(log_queue)
+    logger.addHandler(queue_handler)
+    if not _listeners:
+        # write what is still queued/buffered if after_all never runs
+        atexit.register(stop_queue_logging)
+    _listeners.append((logger, queue_handler, listener))
+    return listener
+
+
+def stop_queue_logging() -> None:
+    """Drain the queues, flush and close the handlers of every listener (call from after_all)."""
+    while _listeners:
+        logger, queue_handler, listener = _listeners.pop()
+        logger.removeHandler(queue_handler)
+        listener.stop()
+        for handler in listener.handlers:
+            handler.flush()
+            handler.close()
+            target = getattr(handler, "target", None)
+            if target is not None:
+                target.close()
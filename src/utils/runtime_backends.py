@@ -0,0 +1,302 @@
+# runtime_backends.py
+from __future__ import annotations
+
+import json
+import os
+import sqlite3
+from typing import Any, Dict, Optional, Set, Tuple
+
+import file_utils as fileUtils
+import snapshot_utils as snapshotUtils
+
+
+# A changed location in the runtime data, e.g. ("results", key) or ("testData", 2, key)
+DataPath = Tuple[Any, ...]
+
+SQLITE_SUFFIXES = (".db", ".sqlite", ".sqlite3")
+
+_MISSING = object()
+
+
+def _file_version(file_path: str) -> Optional[Tuple[int, int]]:
+    try:
+        stat = os.stat(file_path)
+    except FileNotFoundError:
+        return None
+    return stat.st_mtime_ns, stat.st_size
+
+
+def copy_path(source: Any, target: Any, path: DataPath) -> None:
+    """
+    Make target[path] equal to source[path] (or delete it when source has no
+    value there). Missing containers in target are created.
+    """
+    src: Any = source
+    for part in path:
+        try:
+            src = src[part]
+        except (KeyError, IndexError, TypeError):
+            src = _MISSING
+            break
+
+    dst: Any = target
+    for part, next_part in zip(path[:-1], path[1:]):
+        empty: Any = [] if isinstance(next_part, int) else {}
+        if isinstance(dst, list):
+            while len(dst) <= part:
+                dst.append({})
+            if not isinstance(dst[part], type(empty)):
+                dst[part] = empty
+        elif not isinstance(dst.get(part), type(empty)):
+            dst[part] = empty
+        dst = dst[part]
+
+    last = path[-1]
+    if src is _MISSING:
+        if isinstance(dst, dict):
+            dst.pop(last, None)
+    elif isinstance(dst, list):
+        while len(dst) <= last:
+            dst.append({})
+        dst[last] = src
+    else:
+        dst[last] = src
+
+
+class JsonRuntimeBackend:
+    """
+    Runtime data in a pretty-printed JSON file (the original format).
+
+    save() holds an inter-process file lock and replaces the file
+    atomically. If another process wrote the file since it was loaded, only
+    the changed paths are applied on top of the current file content, so
+    disjoint updates are not lost. Same path: last save wins.
+    """
+
+    def __init__(self, file_path: str):
+        self.file_path = file_path
+        self._version: Optional[Tuple[int, int]] = None
+
+    def load(self) -> Dict[str, Any]:
+        self._version = _file_version(self.file_path)
+        return self._read()
+
+    def _read(self) -> Dict[str, Any]:
+        return fileUtils.read_json_data(self.file_path)
+
+    def _write(self, data: Dict[str, Any]) -> None:
+        fileUtils.write_json_data_atomic(self.file_path, data)
+
+    def save(self, data: Dict[str, Any], changed: Optional[Set[DataPath]]) -> Dict[str, Any]:
+        """
+        Persist data. changed=None writes the whole document.
+        Returns the data as stored (merged with other writers' changes).
+        """
+        with fileUtils.file_lock(self.file_path):
+            current_version = _file_version(self.file_path)
+            if changed is not None and current_version is not None and current_version != self._version:
+                merged = self._read()
+                for path in sorted(changed, key=len):
+                    copy_path(data, merged, path)
+                data = merged
+            self._write(data)
+            self._version = _file_version(self.file_path)
+        return data
+
+
+class SnapshotRuntimeBackend(JsonRuntimeBackend):
+    """
+    Runtime data in a compact binary snapshot (.rtd, see snapshot_utils).
+    Same locking and merge rules as the JSON backend.
+    """
+
+    def _read(self) -> Dict[str, Any]:
+        return snapshotUtils.read_snapshot(self.file_path)
+
+    def _write(self, data: Dict[str, Any]) -> None:
+        snapshotUtils.write_snapshot(self.file_path, data)
+
+
+class SqliteRuntimeBackend:
+    """
+    Runtime data in a SQLite file.
+
+    Top-level keys live in runtime_values; top-level arrays keep one row per
+    element in runtime_rows. save() applies only the changed paths to the
+    stored keys/rows in one transaction, so many small updates do not
+    rewrite the whole document and disjoint updates from other processes
+    are kept. Same path: last save wins.
+    """
+
+    def __init__(self, file_path: str):
+        self.file_path = file_path
+        self._conn: Optional[sqlite3.Connection] = None
+        self._data_version: Optional[int] = None
+
+    @property
+    def conn(self) -> sqlite3.Connection:
+        if self._conn is None:
+            if os.path.dirname(self.file_path):
+                os.makedirs(os.path.dirname(self.file_path), exist_ok=True)
+            # isolation_level=None: transactions are managed explicitly
+            self._conn = sqlite3.connect(self.file_path, timeout=30, isolation_level=None)
+            self._conn.executescript("""
+                CREATE TABLE IF NOT EXISTS runtime_values (
+                    key TEXT PRIMARY KEY,
+                    is_array INTEGER NOT NULL,
+                    value TEXT
+                );
+                CREATE TABLE IF NOT EXISTS runtime_rows (
+                    array_name TEXT NOT NULL,
+                    idx INTEGER NOT NULL,
+                    data TEXT NOT NULL,
+                    PRIMARY KEY (array_name, idx)
+                );
+            """)
+        return self._conn
+
+    def close(self) -> None:
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
+
+    def _current_data_version(self) -> int:
+        return self.conn.execute("PRAGMA data_version").fetchone()[0]
+
+    def load(self) -> Dict[str, Any]:
+        data: Dict[str, Any] = {}
+        for key, is_array, value in self.conn.execute("SELECT key, is_array, value FROM runtime_values"):
+            data[key] = [] if is_array else json.loads(value)
+
+        for array_name, idx, row in self.conn.execute(
+            "SELECT array_name, idx, data FROM runtime_rows ORDER BY array_name, idx"
+        ):
+            arr = data.setdefault(array_name, [])
+            while len(arr) < idx:
+                arr.append({})
+            arr.append(json.loads(row))
+
+        self._data_version = self._current_data_version()
+        return data
+
+    def save(self, data: Dict[str, Any], changed: Optional[Set[DataPath]]) -> Dict[str, Any]:
+        """
+        Persist data. changed=None rewrites everything.
+        Returns the data as stored (reloaded when another process saved in between).
+        """
+        conn = self.conn
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            # checked under the write lock, so no commit can slip in between
+            other_writer = self._data_version is not None and self._current_data_version() != self._data_version
+            if changed is None:
+                conn.execute("DELETE FROM runtime_values")
+                conn.execute("DELETE FROM runtime_rows")
+                for key in data:
+                    self._write_key(key, data)
+            else:
+                for path in sorted(changed, key=len):
+                    key = path[0]
+                    arr = data.get(key)
+                    if len(path) > 1 and isinstance(path[1], int) and isinstance(arr, list):
+                        self._write_row_path(path, data)
+                    elif len(path) > 1 and isinstance(data.get(key), dict):
+                        self._write_value_path(path, data)
+                    else:
+                        self._write_key(key, data)
+            conn.execute("COMMIT")
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+
+        if other_writer:
+            return self.load()
+        self._data_version = self._current_data_version()
+        return data
+
+    def _write_key(self, key: str, data: Dict[str, Any]) -> None:
+        conn = self.conn
+        conn.execute("DELETE FROM runtime_values WHERE key = ?", (key,))
+        conn.execute("DELETE FROM runtime_rows WHERE array_name = ?", (key,))
+        if key not in data:
+            return
+        value = data[key]
+        if isinstance(value, list):
+            conn.execute("INSERT INTO runtime_values (key, is_array, value) VALUES (?, 1, NULL)", (key,))
+            conn.executemany(
+                "INSERT INTO runtime_rows (array_name, idx, data) VALUES (?, ?, ?)",
+                [(key, idx, json.dumps(item, ensure_ascii=False)) for idx, item in enumerate(value)],
+            )
+        else:
+            conn.execute(
+                "INSERT INTO runtime_values (key, is_array, value) VALUES (?, 0, ?)",
+                (key, json.dumps(value, ensure_ascii=False)),
+            )
+
+    def _write_value_path(self, path: DataPath, data: Dict[str, Any]) -> None:
+        """Apply the change at path (key, ...) to the stored value of key only."""
+        conn = self.conn
+        key = path[0]
+        row = conn.execute("SELECT is_array, value FROM runtime_values WHERE key = ?", (key,)).fetchone()
+        if row is None or row[0]:
+            self._write_key(key, data)
+            return
+
+        holder = {key: json.loads(row[1])}
+        copy_path(data, holder, path)
+        conn.execute(
+            "UPDATE runtime_values SET value = ? WHERE key = ?",
+            (json.dumps(holder[key], ensure_ascii=False), key),
+        )
+
+    def _write_row_path(self, path: DataPath, data: Dict[str, Any]) -> None:
+        """Apply the change at path (array, index, ...) to the stored row only."""
+        conn = self.conn
+        array_name, idx = path[0], path[1]
+        conn.execute(
+            "INSERT INTO runtime_values (key, is_array, value) VALUES (?, 1, NULL) "
+            "ON CONFLICT (key) DO UPDATE SET is_array = 1, value = NULL",
+            (array_name,),
+        )
+        row = conn.execute(
+            "SELECT data FROM runtime_rows WHERE array_name = ? AND idx = ?", (array_name, idx)
+        ).fetchone()
+
+        if len(path) == 2 or row is None:
+            stored = data[array_name][idx] if idx < len(data[array_name]) else {}
+        else:
+            holder = {"row": json.loads(row[0])}
+            copy_path({"row": data[array_name][idx]}, holder, ("row",) + tuple(path[2:]))
+            stored = holder["row"]
+
+        conn.execute(
+            "INSERT OR REPLACE INTO runtime_rows (array_name, idx, data) VALUES (?, ?, ?)",
+            (array_name, idx, json.dumps(stored, ensure_ascii=False)),
+        )
+
+
+def backend_for_file(file_path: str):
+    """SQLite backend for .db/.sqlite/.sqlite3 files, snapshot backend for .rtd, JSON otherwise."""
+    if file_path.lower().endswith(SQLITE_SUFFIXES):
+        return SqliteRuntimeBackend(file_path)
+    if snapshotUtils.is_snapshot_file(file_path):
+        return SnapshotRuntimeBackend(file_path)
+    return JsonRuntimeBackend(file_path)
+
+
+def import_runtime_json_to_sqlite(json_file: str, sqlite_file: str) -> None:
+    """Load a runtime data JSON file into a SQLite runtime file (replacing its content)."""
+    backend = SqliteRuntimeBackend(sqlite_file)
+    try:
+        backend.save(fileUtils.read_json_data(json_file), None)
+    finally:
+        backend.close()
+
+
+def export_runtime_sqlite_to_json(sqlite_file: str, json_file: str) -> None:
+    """Write the content of a SQLite runtime file as runtime data JSON."""
+    backend = SqliteRuntimeBackend(sqlite_file)
+    try:
+        fileUtils.write_json_data(json_file, backend.load())
+    finally:
+        backend.close()
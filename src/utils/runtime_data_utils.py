@@ -1,13 +1,19 @@
 
 from __future__ import annotations
 
+import atexit
+import copy
 import json
+import os
 import random
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Union
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple, Union
 
 import file_utils as fileUtils
+import runtime_backends as backends
+import snapshot_utils as snapshotUtils
 import test_context as tcontext
+from runtime_backends import DataPath
 
 
 DEFAULT_INITIAL_DATA = {
@@ -23,21 +29,36 @@ def create_run_time_data_json_file(
     run_time_data_folder: str,
     environment: str,
     initial_data: Union[str, Dict[str, Any]] = DEFAULT_INITIAL_DATA,
+    extension: str = ".json",
 ) -> str:
     """
     TS: createRunTimeDataJsonFie
 
     - Ensures runtime folder exists
-    - Builds filename: <folder>/<environment>-<basefilename>.json
+    - Builds filename: <folder>/<environment>-<basefilename><extension>
     - Creates file with initial_data if it does not exist
+      (extension .db/.sqlite/.sqlite3 creates a SQLite runtime file,
+      .rtd a binary snapshot, see snapshot_utils)
     - Returns the absolute/relative filename string
     """
     fileUtils.check_folder_and_create(run_time_data_folder)
 
     base_name = get_run_time_data_file_name(r_filename)
-    filename = str(Path(run_time_data_folder) / f"{environment}-{base_name}.json")
-
-    if not Path(filename).exists():
+    filename = str(Path(run_time_data_folder) / f"{environment}-{base_name}{extension}")
+
+    if filename.lower().endswith(backends.SQLITE_SUFFIXES):
+        if not Path(filename).exists():
+            data = json.loads(initial_data) if isinstance(initial_data, str) else initial_data
+            backend = backends.SqliteRuntimeBackend(filename)
+            try:
+                backend.save(data, None)
+            finally:
+                backend.close()
+    elif snapshotUtils.is_snapshot_file(filename):
+        if not Path(filename).exists():
+            data = json.loads(initial_data) if isinstance(initial_data, str) else initial_data
+            snapshotUtils.write_snapshot(filename, data)
+    elif not Path(filename).exists():
         # initial_data may be a JSON string or dict
         if isinstance(initial_data, str):
             Path(filename).write_text(initial_data, encoding="utf-8")
@@ -81,20 +102,127 @@ def get_run_time_data_file_path() -> str:
     return tcontext.testContext.runtime_storage_file
 
 
+class RuntimeDataStore:
+    """
+    In-memory copy of one runtime data file.
+
+    The file is loaded on first access and all reads are served from memory.
+    Writes only mark the store dirty; the backend persists them on flush()
+    (environment.py flushes after every step and scenario). The backend
+    depends on the file name: SQLite for .db/.sqlite/.sqlite3, JSON
+    otherwise (see runtime_backends). Both merge the changed paths with
+    updates made by other processes sharing the file.
+
+    NOTE: getters return the stored objects themselves, not copies.
+    """
+
+    def __init__(self, file_path: str):
+        self.file_path = file_path
+        self.backend = backends.backend_for_file(file_path)
+        self._data: Optional[Dict[str, Any]] = None
+        self._changed: Set[DataPath] = set()
+        self._replaced = False
+        self._scenario_lookup: Dict[str, Dict[Tuple[str, str], int]] = {}
+        self.dirty = False
+
+    @property
+    def data(self) -> Dict[str, Any]:
+        if self._data is None:
+            self._data = self.backend.load()
+        return self._data
+
+    def update(self, data: Dict[str, Any], changed: Optional[Iterable[DataPath]] = None) -> None:
+        """
+        Replace the stored data (usually the same, mutated object) and mark it dirty.
+        changed lists the paths that were modified; None means the whole document.
+        """
+        self._data = data
+        if changed is None:
+            self._replaced = True
+            self._scenario_lookup.clear()
+        else:
+            for path in changed:
+                self._changed.add(tuple(path))
+                self._scenario_lookup.pop(path[0], None)
+        self.dirty = True
+
+    def flush(self) -> None:
+        """Persist the data if it changed since the last flush."""
+        if not self.dirty or self._data is None:
+            return
+
+        stored = self.backend.save(self._data, None if self._replaced else self._changed)
+        if stored is not self._data:
+            # Merged with changes of another process
+            self._data = stored
+            self._scenario_lookup.clear()
+        self._changed = set()
+        self._replaced = False
+        self.dirty = False
+
+    def reload(self) -> None:
+        """Drop the in-memory copy (unflushed changes are lost); the file is read again on next access."""
+        self._data = None
+        self._changed = set()
+        self._replaced = False
+        self._scenario_lookup.clear()
+        self.dirty = False
+
+    def find_scenario_index(self, key_array_name: str, iteration_count: Any, dataset: Any) -> int:
+        """
+        Index of the first element of key_array_name whose Iteration/DataSet
+        match (compared as strings), or -1. Uses a lookup table per array
+        that is rebuilt only after that array changes.
+        """
+        lookup = self._scenario_lookup.get(key_array_name)
+        if lookup is None:
+            lookup = {}
+            arr = self.data.get(key_array_name, [])
+            if isinstance(arr, list):
+                for i, obj in enumerate(arr):
+                    lookup.setdefault((str(obj.get("Iteration")), str(obj.get("DataSet"))), i)
+            self._scenario_lookup[key_array_name] = lookup
+        return lookup.get((str(iteration_count), str(dataset)), -1)
+
+
+_stores: Dict[str, RuntimeDataStore] = {}
+
+
+def get_runtime_store(file_path: Optional[str] = None) -> RuntimeDataStore:
+    """
+    Return the store of file_path (default: the current runtime data file).
+    """
+    path = os.path.abspath(file_path or get_run_time_data_file_path())
+    if path not in _stores:
+        _stores[path] = RuntimeDataStore(path)
+    return _stores[path]
+
+
+def flush_run_time_data() -> None:
+    """
+    Write all pending runtime data changes to disk.
+    """
+    for store in _stores.values():
+        store.flush()
+
+
+atexit.register(flush_run_time_data)
+
+
 def _load_runtime_json() -> Dict[str, Any]:
     """
-    Helper: read the runtime storage JSON
+    Helper: runtime storage data (cached in memory)
     """
-    runtime_file = get_run_time_data_file_path()
-    return fileUtils.read_json_data(runtime_file)
+    return get_runtime_store().data
 
 
-def _save_runtime_json(data: Dict[str, Any]) -> None:
+def _save_runtime_json(data: Dict[str, Any], changed: Optional[Iterable[DataPath]] = None) -> None:
     """
-    Helper: write the runtime storage JSON
+    Helper: store the runtime data; written to disk on flush_run_time_data()
+    changed: paths modified in data (None = whole document), used to merge
+    with concurrent writers
     """
-    runtime_file = get_run_time_data_file_path()
-    fileUtils.write_json_data(runtime_file, data)
+    get_runtime_store().update(data, changed)
 
 
 def set_run_time_data(key: str, value: Any) -> None:
@@ -103,7 +231,7 @@ def set_run_time_data(key: str, value: Any) -> None:
     """
     run_time_data = _load_runtime_json()
     run_time_data[key] = value
-    _save_runtime_json(run_time_data)
+    _save_runtime_json(run_time_data, [(key,)])
 
 
 def remove_run_time_data(key: str) -> None:
@@ -112,7 +240,7 @@ def remove_run_time_data(key: str) -> None:
     """
     run_time_data = _load_runtime_json()
     run_time_data.pop(key, None)
-    _save_runtime_json(run_time_data)
+    _save_runtime_json(run_time_data, [(key,)])
 
 
 def set_run_time_scenario_data(
@@ -139,13 +267,15 @@ def set_run_time_scenario_data(
         if not isinstance(arr[testdata_index], dict):
             arr[testdata_index] = {}
         arr[testdata_index][key] = value
+        changed: List[DataPath] = [(key_array_name, testdata_index, key)]
     else:
         run_time_data.setdefault("testData", [])
         # TS forced string values via JSON.parse(`{"key":"value"}`)
         run_time_data["testData"].append({key: str(value)})
+        changed = [("testData",), (key_array_name,)]
 
     run_time_data[key_array_name] = arr if isinstance(arr, list) else run_time_data.get(key_array_name, [])
-    _save_runtime_json(run_time_data)
+    _save_runtime_json(run_time_data, changed)
 
 
 def get_filename_with_scenario_id(key: str, env: str, run_time_data_folder: str) -> Optional[str]:
@@ -237,7 +367,7 @@ def copy_json_specific_data(source: str, destination: str, test_data_index: int)
     for k, v in src_obj[test_data_index].items():
         data[destination][k] = v
 
-    _save_runtime_json(data)
+    _save_runtime_json(data, [(destination, k) for k in src_obj[test_data_index]])
 
 
 def get_runtime_scenario_data(key_array_name: str, iteration_count: str, dataset: str) -> Any:
@@ -246,15 +376,8 @@ def get_runtime_scenario_data(key_array_name: str, iteration_count: str, dataset
     Finds object where obj.Iteration == iteration_count and obj.DataSet == dataset
     Returns the object or ''.
     """
-    data = _load_runtime_json()
-    arr = data.get(key_array_name, [])
-    if not isinstance(arr, list):
-        return ""
-
-    for obj in arr:
-        if str(obj.get("Iteration")) == str(iteration_count) and str(obj.get("DataSet")) == str(dataset):
-            return obj
-    return ""
+    index = get_runtime_store().find_scenario_index(key_array_name, iteration_count, dataset)
+    return _load_runtime_json()[key_array_name][index] if index >= 0 else ""
 
 
 def get_runtime_scenario_index(key_array_name: str, iteration_count: str, dataset: str) -> int:
@@ -262,15 +385,7 @@ def get_runtime_scenario_index(key_array_name: str, iteration_count: str, datase
     TS: getRuntimeScenarioIndex
     Returns the index of matching scenario or -1.
     """
-    data = _load_runtime_json()
-    arr = data.get(key_array_name, [])
-    if not isinstance(arr, list):
-        return -1
-
-    for i, obj in enumerate(arr):
-        if str(obj.get("Iteration")) == str(iteration_count) and str(obj.get("DataSet")) == str(dataset):
-            return i
-    return -1
+    return get_runtime_store().find_scenario_index(key_array_name, iteration_count, dataset)
 
 
 def add_or_update_run_time_results_data(key: str, value: Any) -> None:
@@ -282,7 +397,7 @@ def add_or_update_run_time_results_data(key: str, value: Any) -> None:
     if not isinstance(data["results"], dict):
         data["results"] = {}
     data["results"][key] = value
-    _save_runtime_json(data)
+    _save_runtime_json(data, [("results", key)])
 
 
 def add_or_update_run_time_scenario_data(array_name: str, index: int, key: str, value: Any) -> None:
@@ -303,7 +418,7 @@ def add_or_update_run_time_scenario_data(array_name: str, index: int, key: str,
         arr[index] = {}
 
     arr[index][key] = value
-    _save_runtime_json(data)
+    _save_runtime_json(data, [(array_name, index, key)])
 
 
 def set_run_time_data_with_pipe_symbol(key: str, value: str) -> None:
@@ -315,7 +430,7 @@ def set_run_time_data_with_pipe_symbol(key: str, value: str) -> None:
         data[key] = value
     else:
         data[key] = f"{data[key]}|{value}"
-    _save_runtime_json(data)
+    _save_runtime_json(data, [(key,)])
 
 
 def set_run_time_data_with_comma(key: str, value: str) -> None:
@@ -327,7 +442,7 @@ def set_run_time_data_with_comma(key: str, value: str) -> None:
         data[key] = value
     else:
         data[key] = f"{data[key]},{value}"
-    _save_runtime_json(data)
+    _save_runtime_json(data, [(key,)])
 
 
 def store_in_runtime_data_file(run_time_data: Dict[str, Any]) -> None:
@@ -341,18 +456,20 @@ def store_in_runtime_data_file(run_time_data: Dict[str, Any]) -> None:
       Else: create file
     """
     runtime_file = get_run_time_data_file_path()
+    store = get_runtime_store(runtime_file)
     run_time_data["results"] = {}
 
     if fileUtils.is_file_exist(runtime_file):
-        existing = fileUtils.read_json_data(runtime_file)
-        existing_test_data = existing.get("testData", [])
+        existing_test_data = store.data.get("testData", [])
         if isinstance(existing_test_data, list) and len(existing_test_data) == 0:
-            Path(runtime_file).write_text(json.dumps(run_time_data, indent=2), encoding="utf-8")
+            store.update(run_time_data)
+            store.flush()
             print(f"\n{runtime_file}  ### file  updated")
         else:
             print(f"{runtime_file}\n file already upto date")
     else:
-        Path(runtime_file).write_text(json.dumps(run_time_data, indent=2), encoding="utf-8")
+        store.update(run_time_data)
+        store.flush()
         print(f"{runtime_file} ### file created")
 
 
@@ -384,55 +501,121 @@ def copy_data_from_source_json_to_runtime_data(
               if exclude_keys_list is not None else []
     exclude = exclude or []
 
+    changed: List[DataPath] = []
     for k, v in source_data.items():
         if exclude:
             if str(k).strip() not in [str(x).strip() for x in exclude]:
                 arr[index][k] = v
+                changed.append((key_array_name, index, k))
         else:
             arr[index][k] = v
+            changed.append((key_array_name, index, k))
+
+    _save_runtime_json(data, changed)
+
+
+class StaticDataCache:
+    """
+    Parse-once cache for static test data files.
+
+    Each source file is parsed once per process and re-read only when its
+    mtime/size change. testData is grouped by TestScenario when the file is
+    loaded, so a scenario lookup is a dict access instead of a scan.
+    Returned records are deep copies: callers may modify them freely.
+    """
+
+    def __init__(self):
+        self._entries: Dict[str, Tuple[Tuple[int, int], Dict[Any, List[Dict[str, Any]]]]] = {}
+
+    def scenarios(self, file_path: str, test_scenario_id: Any) -> List[Dict[str, Any]]:
+        by_scenario = self._grouped(file_path)
+        try:
+            found = by_scenario.get(test_scenario_id, [])
+        except TypeError:
+            # unhashable id never equals a grouped value
+            found = []
+        return copy.deepcopy(found)
 
-    _save_runtime_json(data)
+    def invalidate(self, file_path: Optional[str] = None) -> None:
+        """Forget one file (or all files when file_path is None)."""
+        if file_path is None:
+            self._entries.clear()
+        else:
+            self._entries.pop(os.path.abspath(file_path), None)
+
+    def _grouped(self, file_path: str) -> Dict[Any, List[Dict[str, Any]]]:
+        path = os.path.abspath(file_path)
+        stat = os.stat(path)
+        version = (stat.st_mtime_ns, stat.st_size)
+
+        entry = self._entries.get(path)
+        if entry is not None and entry[0] == version:
+            return entry[1]
+
+        by_scenario: Dict[Any, List[Dict[str, Any]]] = {}
+        for scenario_data in fileUtils.read_json_data(path).get("testData", []):
+            try:
+                by_scenario.setdefault(scenario_data.get("TestScenario"), []).append(scenario_data)
+            except TypeError:
+                continue
+        self._entries[path] = (version, by_scenario)
+        return by_scenario
+
+
+static_data_cache = StaticDataCache()
 
 
-def get_scenarios_data_as_array(file_path: str, test_scenario_id: str) -> List[Dict[str, Any]]:
+def get_scenarios_data_as_array(file_path: str, test_scenario_id: str, stream: bool = False) -> List[Dict[str, Any]]:
     """
     TS: getScenariosDataAsArray
     Filters staticData.testData where TestScenario == testScenarioId
-    """
-    static_data = fileUtils.read_json_data(file_path)
-    scenarios: List[Dict[str, Any]] = []
 
-    for scenario_data in static_data.get("testData", []):
-        if scenario_data.get("TestScenario") == test_scenario_id:
-            scenarios.append(scenario_data)
+    - default: served from static_data_cache (the file is parsed once per process)
+    - stream=True: testData is read element by element and only the matching
+      records are kept (for files too large to hold in every worker)
+    - .ndjson/.jsonl files (one testData record per line) are always streamed
+    - .rtd snapshots (see snapshot_utils) decode only the matching records
+    """
+    def matches(scenario_data: Any) -> bool:
+        return isinstance(scenario_data, dict) and scenario_data.get("TestScenario") == test_scenario_id
 
-    return scenarios
+    if snapshotUtils.is_snapshot_file(file_path):
+        with snapshotUtils.Snapshot(file_path) as snapshot:
+            return snapshot.scenario_items("testData", test_scenario_id)
+    if fileUtils.is_ndjson_file(file_path):
+        return list(fileUtils.iter_ndjson(file_path, matches))
+    if stream:
+        return list(fileUtils.iter_json_array_items(file_path, "testData", matches))
+    return static_data_cache.scenarios(file_path, test_scenario_id)
 
 
-def copy_scenarios_data_to_runtime_data_file(test_scenario_id: Any, complete_folder_path: str, source_file: str) -> None:
+def copy_scenarios_data_to_runtime_data_file(
+    test_scenario_id: Any, complete_folder_path: str, source_file: str, stream: bool = False
+) -> None:
     """
     TS: copyScenariosDataToRuntimeDataFile
 
+    - scenarioData = get_scenarios_data_as_array(source_file, test_scenario_id, stream) (once, TS did it per file)
     - For each .json filename in folder:
-        - scenarioData = get_scenarios_data_as_array(source_file, test_scenario_id)
         - if scenarioData exists:
             dataArrayKey = filename.replace('D_','').replace('.json','')
-            runtime_json[dataArrayKey] = scenarioData
-        - write runtime file (TS writes inside loop)
+            runtime_json[dataArrayKey] = copy of scenarioData
+        - store runtime data once after the loop (TS wrote the file inside the loop)
     """
-    runtime_file = get_run_time_data_file_path()
     file_names = fileUtils.get_file_names_from_dir(complete_folder_path)
     data = _load_runtime_json()
-
-    for filename in file_names:
-        if ".json" in filename:
-            scenario_data = get_scenarios_data_as_array(source_file, str(test_scenario_id))
-            if scenario_data:
-                data_array_key = filename.replace("D_", "").replace(".json", "")
-                data[data_array_key] = scenario_data
-
-        if fileUtils.is_file_exist(runtime_file):
-            Path(runtime_file).write_text(json.dumps(data, indent=2), encoding="utf-8")
+    changed: List[DataPath] = []
+
+    json_file_names = [filename for filename in file_names if ".json" in filename]
+    scenario_data = get_scenarios_data_as_array(source_file, str(test_scenario_id), stream) if json_file_names else []
+    if scenario_data:
+        for filename in json_file_names:
+            data_array_key = filename.replace("D_", "").replace(".json", "")
+            # every key gets its own records, as with one read per file
+            data[data_array_key] = copy.deepcopy(scenario_data)
+            changed.append((data_array_key,))
+
+    _save_runtime_json(data, changed)
 
 
 def return_random_number(max_value: int, min_value: int = 0) -> int:
@@ -0,0 +1,198 @@
+# snapshot_utils.py
+# Compact binary snapshot format (.rtd) for runtime and static test data.
+#
+# Layout (little endian):
+#
+#     b"RTD1" | u64 header length | header (compact JSON) | data
+#
+# The header maps every top-level key to where its value lives in the data
+# area, so one key can be decoded without touching the others:
+#
+#     {"keys": {"results": {"value": [offset, length]},
+#               "testData": {"array": [offset, length],
+#                            "items": [table_offset, count],
+#                            "scenarios": [offset, length]}}}
+#
+# Values are stored as compact JSON. Top-level arrays also get a table of
+# (u64 offset, u32 length) pairs pointing at each element, so single elements
+# can be read lazily; arrays of objects with a string TestScenario also store
+# a {TestScenario: [element indexes]} map. The file is memory-mapped for reads.
+from __future__ import annotations
+
+import json
+import mmap
+import os
+import struct
+import tempfile
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, Optional
+
+import file_utils as fileUtils
+
+
+SNAPSHOT_SUFFIX = ".rtd"
+
+_MAGIC = b"RTD1"
+_PREAMBLE = struct.Struct("<4sQ")
+_ITEM = struct.Struct("<QI")
+
+
+def is_snapshot_file(file_path: str) -> bool:
+    return str(file_path).lower().endswith(SNAPSHOT_SUFFIX)
+
+
+def _dumps(value: Any) -> bytes:
+    return json.dumps(value, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+def write_snapshot(file_path: str, data: Dict[str, Any]) -> None:
+    """Write data as a snapshot file (temp file + rename, readers never see a partial file)."""
+    chunks: List[bytes] = []
+    size = 0
+    keys: Dict[str, Any] = {}
+
+    def add(blob: bytes) -> List[int]:
+        nonlocal size
+        chunks.append(blob)
+        size += len(blob)
+        return [size - len(blob), len(blob)]
+
+    for key, value in data.items():
+        if not isinstance(value, list):
+            keys[key] = {"value": add(_dumps(value))}
+            continue
+
+        # the array is stored as one JSON blob ("[a,b,c]") so it can be decoded
+        # in one call; the table points at each element inside it
+        table = bytearray()
+        parts: List[bytes] = []
+        scenarios: Dict[str, List[int]] = {}
+        offset = size + 1
+        for i, item in enumerate(value):
+            part = _dumps(item)
+            parts.append(part)
+            table += _ITEM.pack(offset, len(part))
+            offset += len(part) + 1
+            if isinstance(item, dict) and isinstance(item.get("TestScenario"), str):
+                scenarios.setdefault(item["TestScenario"], []).append(i)
+
+        array = add(b"[" + b",".join(parts) + b"]")
+        entry: Dict[str, Any] = {"array": array, "items": [add(bytes(table))[0], len(value)]}
+        if scenarios:
+            entry["scenarios"] = add(_dumps(scenarios))
+        keys[key] = entry
+
+    header = _dumps({"keys": keys})
+    path = Path(file_path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=str(path.parent), prefix=f".{path.name}.", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(_PREAMBLE.pack(_MAGIC, len(header)))
+            f.write(header)
+            for blob in chunks:
+                f.write(blob)
+        os.replace(tmp_path, str(path))
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+
+class Snapshot:
+    """
+    Memory-mapped reader for a snapshot file. Values are decoded on access.
+    Close it (or use it as a context manager) before the file is replaced.
+    """
+
+    def __init__(self, file_path: str):
+        self.file_path = file_path
+        with open(file_path, "rb") as f:
+            self._mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            magic, header_length = _PREAMBLE.unpack_from(self._mm, 0)
+            if magic != _MAGIC:
+                raise ValueError(f"{file_path} is not a runtime data snapshot")
+            header_end = _PREAMBLE.size + header_length
+            self._keys: Dict[str, Any] = json.loads(self._mm[_PREAMBLE.size:header_end])["keys"]
+        except BaseException:
+            self._mm.close()
+            raise
+        self._base = header_end
+
+    def __enter__(self) -> "Snapshot":
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        self.close()
+
+    def close(self) -> None:
+        self._mm.close()
+
+    def keys(self) -> List[str]:
+        return list(self._keys)
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._keys
+
+    def _decode(self, offset: int, length: int) -> Any:
+        start = self._base + offset
+        return json.loads(self._mm[start:start + length])
+
+    def get(self, key: str, default: Any = None) -> Any:
+        """Decode one top-level value."""
+        entry = self._keys.get(key)
+        if entry is None:
+            return default
+        return self._decode(*entry["value"] if "value" in entry else entry["array"])
+
+    def item_count(self, key: str) -> int:
+        entry = self._keys.get(key)
+        return entry["items"][1] if entry and "items" in entry else 0
+
+    def get_item(self, key: str, index: int) -> Any:
+        """Decode one element of a top-level array."""
+        table_offset, count = self._keys[key]["items"]
+        if not 0 <= index < count:
+            raise IndexError(index)
+        offset, length = _ITEM.unpack_from(self._mm, self._base + table_offset + index * _ITEM.size)
+        return self._decode(offset, length)
+
+    def iter_items(self, key: str, predicate: Optional[Callable[[Any], bool]] = None) -> Iterator[Any]:
+        """Decode the elements of a top-level array one at a time."""
+        for i in range(self.item_count(key)):
+            item = self.get_item(key, i)
+            if predicate is None or predicate(item):
+                yield item
+
+    def scenario_items(self, key: str, test_scenario_id: Any) -> List[Any]:
+        """Elements of key whose TestScenario == test_scenario_id (decodes only those)."""
+        entry = self._keys.get(key)
+        if entry is None or "items" not in entry:
+            return []
+        if not isinstance(test_scenario_id, str):
+            return list(self.iter_items(
+                key, lambda item: isinstance(item, dict) and item.get("TestScenario") == test_scenario_id
+            ))
+        if "scenarios" not in entry:
+            return []
+        indexes = self._decode(*entry["scenarios"]).get(test_scenario_id, [])
+        return [self.get_item(key, i) for i in indexes]
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {key: self.get(key) for key in self._keys}
+
+
+def read_snapshot(file_path: str) -> Dict[str, Any]:
+    """Decode a whole snapshot file."""
+    with Snapshot(file_path) as snapshot:
+        return snapshot.to_dict()
+
+
+def json_to_snapshot(json_file: str, snapshot_file: str) -> None:
+    write_snapshot(snapshot_file, fileUtils.read_json_data(json_file))
+
+
+def snapshot_to_json(snapshot_file: str, json_file: str) -> None:
+    """Write a snapshot back as pretty-printed JSON (for reports and humans)."""
+    fileUtils.write_json_data(json_file, read_snapshot(snapshot_file))